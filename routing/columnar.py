@@ -0,0 +1,184 @@
+import numpy as np
+from routing import entities
+from routing.density import DensityProfile
+
+
+def ranks(a) -> np.ndarray:
+    """exact dense ranks of a column (object columns hold Decimal)"""
+    a = np.asarray(a)
+    if a.dtype != object:
+        return a
+    return np.unique(a, return_inverse=True)[1]
+
+
+def priority_order(width, minx, priority=None) -> np.ndarray:
+    """
+    Stable order of nets: wider first, then higher priority (if given),
+    then leftmost. Same as sorting with cmp_to_key(__cap_priority) or
+    cmp_to_key(__ccap_priority).
+    """
+    keys = [ranks(minx)]
+    if not priority is None:
+        keys.append(-ranks(priority))
+    keys.append(-ranks(width))
+    return np.lexsort(keys)
+
+
+class ColumnarNetList(entities.NetList):
+    """
+    Read-only NetList stored as columns.
+
+    Per-net arrays: width, minx, maxx, mid_bottom_y, mid_upper_y, midy, priority.
+    Pins are CSR style, i.e., the pins of the i-th net are
+    pin_x[pin_offset[i]:pin_offset[i + 1]] (same for pin_y).
+    Indexing and iteration yield Net views, so the routing algorithms
+    accept a ColumnarNetList as is.
+    """
+
+    def __init__(
+        self,
+        names: list,
+        pin_offset: np.ndarray,
+        pin_x: np.ndarray,
+        pin_y: np.ndarray,
+        width: np.ndarray,
+        priority: np.ndarray = None,
+        nets: list = None,
+        pin_y_key: np.ndarray = None,
+    ):
+        self.names = list(names)
+        self.pin_offset = np.asarray(pin_offset, dtype=np.int64)
+        self.pin_x = np.asarray(pin_x)
+        self.pin_y = np.asarray(pin_y)
+        self.width = np.asarray(width)
+        self.priority = priority
+        self._nets = nets
+
+        n_pins = np.diff(self.pin_offset)
+        if np.any(n_pins < 1):
+            raise ValueError("Every net needs at least one pin.")
+        starts = self.pin_offset[:-1]
+        self.net_of_pin = np.repeat(np.arange(len(self.names)), n_pins)
+
+        # x coord --------------
+        if len(self.names) == 0:
+            self.minx = self.maxx = self.pin_x[:0]
+        else:
+            self.minx = np.minimum.reduceat(self.pin_x, starts)
+            self.maxx = np.maximum.reduceat(self.pin_x, starts)
+
+        # y coord --------------
+        # sort pins by y within each net, then take the median pair
+        # (pin_y_key: numeric array in the same order as pin_y, if available)
+        if pin_y_key is None:
+            pin_y_key = ranks(self.pin_y)
+        order = np.lexsort((pin_y_key, self.net_of_pin))
+        self.sorted_pin_y = self.pin_y[order]
+        self.mid_bottom_y = self.sorted_pin_y[starts + (n_pins - 1) // 2]
+        self.mid_upper_y = self.sorted_pin_y[starts + n_pins // 2]
+        mid_sum = self.mid_bottom_y + self.mid_upper_y
+        if np.issubdtype(mid_sum.dtype, np.integer) and np.all(mid_sum % 2 == 0):
+            self.midy = mid_sum // 2
+        elif mid_sum.dtype == object or np.issubdtype(mid_sum.dtype, np.integer):
+            # same as Net.midy (Decimal, or int halves that are not integral)
+            self.midy = np.array(
+                [entities.half(v) for v in mid_sum.tolist()], dtype=object
+            )
+        else:
+            self.midy = mid_sum / 2
+
+    @classmethod
+    def from_netlist(cls, netlist: list):
+        pin_offset = np.cumsum([0] + [n.n_pins for n in netlist])
+        pin_x = [x for n in netlist for x in n.x]
+        pin_y = [y for n in netlist for y in n.y]
+        return cls(
+            names=[n.name for n in netlist],
+            pin_offset=pin_offset,
+            pin_x=np.array(pin_x, dtype=_dtype(pin_x)),
+            pin_y=np.array(pin_y, dtype=_dtype(pin_y)),
+            width=np.array(
+                [n.width for n in netlist], dtype=_dtype([n.width for n in netlist])
+            ),
+            nets=list(netlist),
+        )
+
+    # Net views ----------------
+    def net(self, i: int) -> entities.Net:
+        s, e = self.pin_offset[i], self.pin_offset[i + 1]
+        priority = None if self.priority is None else self.priority[i]
+        return entities.Net.from_coords(
+            self.names[i],
+            self.pin_x[s:e].tolist(),
+            self.pin_y[s:e].tolist(),
+            width=self.width[i].item() if self.width.dtype != object else self.width[i],
+            priority=priority,
+        )
+
+    @property
+    def data(self) -> list:
+        if self._nets is None:
+            self._nets = [self.net(i) for i in range(len(self.names))]
+        return self._nets
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return entities.NetList(self.data[i])
+        return self.data[i]
+
+    def copy(self) -> entities.NetList:
+        return entities.NetList(self.data)
+
+    def __add__(self, other) -> entities.NetList:
+        return entities.NetList(self.data) + other
+
+    def __radd__(self, other) -> entities.NetList:
+        return other + entities.NetList(self.data)
+
+    def __mul__(self, n: int) -> entities.NetList:
+        return entities.NetList(self.data) * n
+
+    __rmul__ = __mul__
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("ColumnarNetList is read-only; copy it into a NetList.")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = insert = pop = remove = clear = reverse = sort = extend = _read_only
+
+    # aggregates ----------------
+    def horizontal_wirelength(self):
+        if len(self) == 0:
+            return 0
+        return (self.maxx - self.minx).sum()
+
+    def vertical_wirelength(self):
+        if len(self) == 0:
+            return 0
+        return np.abs(self.pin_y - self.midy[self.net_of_pin]).sum()
+
+    def n_pins(self) -> int:
+        return len(self.pin_y)
+
+    def density_profile(self) -> DensityProfile:
+        return DensityProfile(self.minx, self.maxx, self.width)
+
+    def priority_order(self, priority=None) -> np.ndarray:
+        if priority is None:
+            priority = self.priority
+        return priority_order(self.width, self.minx, priority)
+
+
+def _dtype(values: list):
+    # keep Decimal exact; ints (fixed point) and floats as native arrays
+    int64 = np.iinfo(np.int64)
+    if len(values) > 0 and all(isinstance(v, int) for v in values):
+        if int64.min <= min(values) and max(values) <= int64.max:
+            return np.int64
+        return object
+    if len(values) > 0 and all(isinstance(v, float) for v in values):
+        return np.float64
+    return object
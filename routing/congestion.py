@@ -0,0 +1,210 @@
+import math
+import heapq
+from fractions import Fraction
+import numpy as np
+from routing import columnar
+
+
+def closest_gaps(gap_heights: np.ndarray, ys: np.ndarray) -> tuple:
+    """indices of the 1st and 2nd closest gaps for every y"""
+    n_gaps = len(gap_heights)
+    order = np.argsort(gap_heights, kind="stable")
+    sorted_heights = gap_heights[order]
+    # the two closest gaps are among the two below and the two above
+    p = np.searchsorted(sorted_heights, ys)
+    cand = p[:, None] + np.array([-2, -1, 0, 1])
+    valid = (0 <= cand) & (cand < n_gaps)
+    cand = order[np.clip(cand, 0, n_gaps - 1)]
+    diff = np.abs(gap_heights[cand] - ys[:, None])
+    # rank diff over the whole matrix so Decimal diff sorts exactly
+    diff = columnar.ranks(diff.ravel()).reshape(diff.shape)
+    closest = np.lexsort((cand, diff, ~valid), axis=-1)
+    sorted_cand = np.take_along_axis(cand, closest, axis=-1)
+    # equidistant gaps: pick them as np.argsort over all gaps does (over an
+    # object array, so fixed-point ints break ties as Decimal does)
+    sorted_diff = np.take_along_axis(diff, closest, axis=-1)
+    sorted_valid = np.take_along_axis(valid, closest, axis=-1)
+    ties = np.flatnonzero(
+        (sorted_diff[:, 0] == sorted_diff[:, 1]) & sorted_valid[:, 1]
+        | (sorted_diff[:, 1] == sorted_diff[:, 2]) & sorted_valid[:, 2]
+    )
+    for i in ties:
+        sorted_cand[i, :2] = np.argsort(np.abs(gap_heights - ys[i]).astype(object))[:2]
+
+    first_close = sorted_cand[:, 0]
+    # if only one gap remains, 2nd closest one is equal to 1st one
+    if n_gaps == 1:
+        second_close = first_close
+    else:
+        second_close = sorted_cand[:, 1]
+    return first_close, second_close
+
+
+class GapCongestion:
+    """
+    Gap congestion (as algos.calc_gap_congestion) kept up to date under net
+    and gap deletion.
+
+    A net spreads 1 over the remaining gaps inside its optimal interval, or
+    puts 1 on its best gap if there is none. shares[p, k] counts the nets
+    spreading 1/k on the gap at height rank p, so spreading a net is one
+    int slice add. Deleting nets subtracts their share; popping a gap
+    re-spreads only the nets whose optimal interval contains it or whose
+    1st / 2nd closest gap it is. pop() takes the least (most if reverse)
+    congested gap from a heap with lazy deletion; ties go to the gap given
+    first. Heap keys are float dot products (relative error below
+    (#gaps + 2) * 2**-53), so only gaps whose keys are that close to the
+    top one are compared exactly.
+    """
+
+    def __init__(
+        self, gaps: list, netlist: list, reverse: bool = False, wl_table=None
+    ):
+        self.gaps = list(gaps)
+        self.reverse = reverse
+        self.wl_table = wl_table
+        n_gaps = len(self.gaps)
+        self.heights = np.array([g.midy for g in self.gaps])
+        self.order = np.argsort(self.heights, kind="stable").tolist()
+        self.rank = np.argsort(self.order).tolist()
+        self.alive = np.ones(n_gaps, dtype=bool)
+        # counts by height rank (of alive gaps only, dead rows are stale)
+        self.shares = np.zeros((n_gaps, n_gaps + 1), dtype=np.int32)
+        self.inv_k = 1.0 / np.maximum(np.arange(n_gaps + 1), 1)
+        self.tolerance = (n_gaps + 2) * 2.0**-51
+        self._version = [0] * n_gaps
+        self._touched = np.ones(n_gaps, dtype=bool)
+
+        self.nets = list(netlist)
+        self.index = dict((n.name, i) for i, n in enumerate(self.nets))
+        self.net_alive = [True] * len(self.nets)
+        sorted_heights = self.heights[self.order]
+        mid_bottom_y = np.array([n.mid_bottom_y for n in self.nets])
+        mid_upper_y = np.array([n.mid_upper_y for n in self.nets])
+        self.l = np.searchsorted(sorted_heights, mid_bottom_y, "left").tolist()
+        self.r = np.searchsorted(sorted_heights, mid_upper_y, "right").tolist()
+        self.n_opt = [r - l for l, r in zip(self.l, self.r)]
+        # nets whose optimal interval holds the gap / whose 1st or 2nd
+        # closest gap it is (nets without optimal gaps only)
+        self.opt_nets = [[] for _ in range(n_gaps)]
+        self.close_nets = [set() for _ in range(n_gaps)]
+        self.best = [None] * len(self.nets)
+        self.close = [()] * len(self.nets)
+        for i in range(len(self.nets)):
+            for p in range(self.l[i], self.r[i]):
+                self.opt_nets[self.order[p]].append(i)
+
+        self._choose_best([i for i, k in enumerate(self.n_opt) if k == 0])
+        for i in range(len(self.nets)):
+            self._spread(i, 1)
+        self._heap = []
+        self._push()
+
+    def __len__(self) -> int:
+        return int(self.alive.sum())
+
+    def _spread(self, i: int, sign: int) -> None:
+        if self.n_opt[i] > 0:
+            self.shares[self.l[i] : self.r[i], self.n_opt[i]] += sign
+            self._touched[self.l[i] : self.r[i]] = True
+        elif self.best[i] is not None:
+            p = self.rank[self.best[i]]
+            self.shares[p, 1] += sign
+            self._touched[p] = True
+
+    def exact(self, j: int) -> Fraction:
+        """exact congestion of gap j"""
+        row = self.shares[self.rank[j]]
+        ks = np.flatnonzero(row).tolist()
+        if len(ks) == 0:
+            return Fraction(0)
+        scale = math.lcm(*ks)
+        return Fraction(sum(int(row[k]) * (scale // k) for k in ks), scale)
+
+    def _choose_best(self, nets: list) -> None:
+        # best gap: 1st or 2nd closest one, whichever gives less wirelength
+        for i in nets:
+            for j in set(self.close[i]):
+                self.close_nets[j].discard(i)
+            self.best[i], self.close[i] = None, ()
+        remaining = np.flatnonzero(self.alive)
+        if len(nets) == 0 or len(remaining) == 0:
+            return
+
+        midy = np.array([self.nets[i].midy for i in nets])
+        first_close, second_close = closest_gaps(self.heights[remaining], midy)
+        first_close = remaining[first_close].tolist()
+        second_close = remaining[second_close].tolist()
+        for i, f, s in zip(nets, first_close, second_close):
+            net = self.nets[i]
+            if self.wl_table is None:
+                first_wl = net.vertical_wirelength(self.gaps[f].midy)
+                second_wl = net.vertical_wirelength(self.gaps[s].midy)
+            else:
+                row = self.wl_table.table[self.wl_table.row[net.name]]
+                first_wl = row[self.wl_table.col[id(self.gaps[f])]]
+                second_wl = row[self.wl_table.col[id(self.gaps[s])]]
+            self.best[i] = f if first_wl < second_wl else s
+            self.close[i] = (f, s)
+            self.close_nets[f].add(i)
+            self.close_nets[s].add(i)
+
+    def _push(self) -> None:
+        sign = -1 if self.reverse else 1
+        ps = np.flatnonzero(self._touched & self.alive[self.order])
+        congestion = self.shares[ps] @ self.inv_k
+        for p, c in zip(ps.tolist(), congestion.tolist()):
+            j = self.order[p]
+            self._version[j] += 1
+            self.gaps[j].congestion = c
+            heapq.heappush(self._heap, (sign * c, j, self._version[j]))
+        self._touched[:] = False
+
+    def remove_nets(self, nets: list) -> None:
+        """delete (assigned) nets; nets not given at construction are ignored"""
+        for n in nets:
+            i = self.index.get(n.name)
+            if i is None or not self.net_alive[i]:
+                continue
+            self._spread(i, -1)
+            self.net_alive[i] = False
+            for j in set(self.close[i]):
+                self.close_nets[j].discard(i)
+        self._push()
+
+    def _pop_valid(self) -> tuple:
+        while True:
+            item = heapq.heappop(self._heap)
+            if self.alive[item[1]] and item[2] == self._version[item[1]]:
+                return item
+
+    def pop(self):
+        """delete and return the next gap in congestion order"""
+        top = self._pop_valid()
+        # keys within twice the rounding error may be out of order
+        bound = top[0] + self.tolerance * (abs(top[0]) + 1.0)
+        close = [top]
+        while len(self._heap) > 0 and self._heap[0][0] <= bound:
+            item = heapq.heappop(self._heap)
+            if self.alive[item[1]] and item[2] == self._version[item[1]]:
+                close.append(item)
+        if len(close) > 1:
+            sign = -1 if self.reverse else 1
+            top = min(close, key=lambda item: (sign * self.exact(item[1]), item[1]))
+            for item in close:
+                if item is not top:
+                    heapq.heappush(self._heap, item)
+        j = top[1]
+
+        opt = [i for i in self.opt_nets[j] if self.net_alive[i]]
+        affected = opt + sorted(self.close_nets[j])
+        for i in affected:
+            self._spread(i, -1)
+        self.alive[j] = False
+        for i in opt:
+            self.n_opt[i] -= 1
+        self._choose_best([i for i in affected if self.n_opt[i] == 0])
+        for i in affected:
+            self._spread(i, 1)
+        self._push()
+        return self.gaps[j]
@@ -0,0 +1,44 @@
+import bisect
+import numpy as np
+
+
+class CoordinateIndex:
+    """
+    Sorted distinct endpoints (minx, maxx) of the nets of a netlist.
+
+    Two nets overlap in x iff an endpoint of one lies in the other, so the
+    heights of a gap only need these slots. The index is built once per
+    netlist and shared read-only by its gaps; the slot range [l, r) of a net
+    is looked up once and then reused by every gap.
+    """
+
+    def __init__(self, netlist: list):
+        # ColumnarNetList has minx/maxx columns
+        if isinstance(getattr(netlist, "minx", None), np.ndarray):
+            coords = np.unique(np.concatenate([netlist.minx, netlist.maxx])).tolist()
+        else:
+            coords = sorted(set([x for n in netlist for x in (n.minx, n.maxx)]))
+        self.coords = coords
+        self._spans = {}
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def index(self, x) -> int:
+        i = bisect.bisect_left(self.coords, x)
+        if i == len(self.coords) or self.coords[i] != x:
+            raise KeyError(x)
+        return i
+
+    def range_index(self, minx, maxx) -> tuple[int, int]:
+        l = bisect.bisect_left(self.coords, minx)
+        r = bisect.bisect_right(self.coords, maxx)
+        return l, r
+
+    def span(self, net) -> tuple[int, int]:
+        """slot range of a net (cached by its endpoints)"""
+        key = (net.minx, net.maxx)
+        s = self._spans.get(key)
+        if s is None:
+            s = self._spans[key] = self.range_index(*key)
+        return s
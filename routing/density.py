@@ -0,0 +1,267 @@
+from decimal import Decimal
+import numpy as np
+
+NEG = Decimal("-Infinity")
+# for fixed-point (int) widths: int + float stays -inf, no Decimal arithmetic
+INT_NEG = float("-inf")
+ADD = "add"
+REMOVE = "remove"
+
+
+class DynamicDensity:
+    """
+    Channel density over the endpoint coordinates of a netlist with net deletion.
+
+    zones() returns what NetList.max_density_zones() would return for the
+    remaining nets (in their original order) without rescanning them: a segment
+    tree over the compressed endpoints keeps, under range-add, the max density of
+    the coordinates whose last event is an add and of those whose last is a remove.
+    """
+
+    def __init__(self, netlist: list):
+        self.coords = sorted(set([x for n in netlist for x in (n.minx, n.maxx)]))
+        index = dict([(x, i) for i, x in enumerate(self.coords)])
+        m = len(self.coords)
+        self.m = m
+
+        # events per coordinate in netlist order; the last alive one decides the
+        # command of the coordinate
+        self._events = [[] for _ in range(m)]
+        self._nets = {}
+        diff = [0] * (m + 1)
+        for n in netlist:
+            l, r = index[n.minx], index[n.maxx]
+            add_event = [ADD, True]
+            remove_event = [REMOVE, True]
+            self._events[l].append(add_event)
+            self._events[r].append(remove_event)
+            self._nets[n.name] = (l, r, n.width, add_event, remove_event)
+            diff[l] += n.width
+            diff[r] -= n.width
+        self._last = [len(es) - 1 for es in self._events]
+
+        density = []
+        acc = 0
+        for i in range(m):
+            acc += diff[i]
+            density.append(acc)
+
+        neg = INT_NEG if all(isinstance(n.width, int) for n in netlist) else NEG
+        self._neg = neg
+        size = 4 * max(m, 1)
+        self._all = [neg] * size
+        self._add = [neg] * size
+        self._remove = [neg] * size
+        self._lz = [0] * size
+        if m > 0:
+            self._build(1, 0, m, density)
+
+    def __len__(self) -> int:
+        return len(self._nets)
+
+    def __contains__(self, net) -> bool:
+        return net.name in self._nets
+
+    def command(self, i: int) -> str:
+        if self._last[i] < 0:
+            return None
+        return self._events[i][self._last[i]][0]
+
+    # segment tree ----------------
+    def _set_leaf(self, k: int, i: int, d) -> None:
+        command = self.command(i)
+        self._all[k] = d
+        self._add[k] = d if command == ADD else self._neg
+        self._remove[k] = d if command == REMOVE else self._neg
+
+    def _pull(self, k: int) -> None:
+        l, r = 2 * k, 2 * k + 1
+        self._all[k] = max(self._all[l], self._all[r])
+        self._add[k] = max(self._add[l], self._add[r])
+        self._remove[k] = max(self._remove[l], self._remove[r])
+
+    def _build(self, k: int, lo: int, hi: int, density: list) -> None:
+        if hi - lo == 1:
+            self._set_leaf(k, lo, density[lo])
+            return
+        mid = (lo + hi) // 2
+        self._build(2 * k, lo, mid, density)
+        self._build(2 * k + 1, mid, hi, density)
+        self._pull(k)
+
+    def _apply(self, k: int, v) -> None:
+        self._all[k] += v
+        self._add[k] += v
+        self._remove[k] += v
+        self._lz[k] += v
+
+    def _push(self, k: int) -> None:
+        if self._lz[k] != 0:
+            self._apply(2 * k, self._lz[k])
+            self._apply(2 * k + 1, self._lz[k])
+            self._lz[k] = 0
+
+    def _range_add(self, k: int, lo: int, hi: int, l: int, r: int, v) -> None:
+        if r <= lo or hi <= l:
+            return
+        if l <= lo and hi <= r:
+            self._apply(k, v)
+            return
+        self._push(k)
+        mid = (lo + hi) // 2
+        self._range_add(2 * k, lo, mid, l, r, v)
+        self._range_add(2 * k + 1, mid, hi, l, r, v)
+        self._pull(k)
+
+    def _refresh(self, k: int, lo: int, hi: int, i: int) -> None:
+        if hi - lo == 1:
+            self._set_leaf(k, i, self._all[k])
+            return
+        self._push(k)
+        mid = (lo + hi) // 2
+        if i < mid:
+            self._refresh(2 * k, lo, mid, i)
+        else:
+            self._refresh(2 * k + 1, mid, hi, i)
+        self._pull(k)
+
+    def _peaks(self, k: int, lo: int, hi: int, peak, found: list) -> None:
+        if self._add[k] != peak:
+            return
+        if hi - lo == 1:
+            found.append(lo)
+            return
+        self._push(k)
+        mid = (lo + hi) // 2
+        self._peaks(2 * k, lo, mid, peak, found)
+        self._peaks(2 * k + 1, mid, hi, peak, found)
+
+    def _first_remove(self, k: int, lo: int, hi: int, l: int) -> int:
+        # leftmost i >= l whose last event is a remove and density is positive
+        if hi <= l or not self._remove[k] > 0:
+            return None
+        if hi - lo == 1:
+            return lo
+        self._push(k)
+        mid = (lo + hi) // 2
+        i = self._first_remove(2 * k, lo, mid, l)
+        if i is None:
+            i = self._first_remove(2 * k + 1, mid, hi, l)
+        return i
+
+    # api ----------------
+    def remove(self, net) -> None:
+        l, r, width, add_event, remove_event = self._nets.pop(net.name)
+        add_event[1] = False
+        remove_event[1] = False
+        self._range_add(1, 0, self.m, l, r, -width)
+        for i in (l, r):
+            while self._last[i] >= 0 and not self._events[i][self._last[i]][1]:
+                self._last[i] -= 1
+            self._refresh(1, 0, self.m, i)
+
+    def max_density(self):
+        if self.m == 0 or not self._add[1] > 0:
+            return 0
+        return self._add[1]
+
+    def zones(self) -> list[tuple]:
+        peak = self.max_density()
+        if peak == 0:
+            return []
+
+        peaks = []
+        self._peaks(1, 0, self.m, peak, peaks)
+        zones = []
+        for j, p in enumerate(peaks):
+            c = self._first_remove(1, 0, self.m, p + 1)
+            if c is None:
+                break
+            # a later peak before the closing remove restarts the zone
+            if j + 1 < len(peaks) and peaks[j + 1] < c:
+                continue
+            zones.append((self.coords[p], self.coords[c]))
+        return zones
+
+
+def sorted_runs(x: np.ndarray) -> tuple:
+    """
+    Stable argsort of x and the starts of its runs of equal values, exact
+    for Decimal (object) arrays.
+    """
+    # float keys keep the order of Decimals, but may tie distinct ones
+    key = x.astype(np.float64) if x.dtype == object else x
+    order = np.argsort(key, kind="stable")
+    sorted_key = key[order]
+    tie = np.flatnonzero(sorted_key[1:] == sorted_key[:-1])
+    if x.dtype == object and np.any(x[order[tie]] != x[order[tie + 1]]):
+        order = np.argsort(x, kind="stable")
+        sorted_key = x[order]
+    is_first = np.concatenate([[True], sorted_key[1:] != sorted_key[:-1]])
+    return order, np.flatnonzero(is_first)
+
+
+class DensityProfile:
+    """
+    Channel density as a piecewise-constant function over the sorted
+    distinct endpoint coordinates: density[i] holds on [coords[i],
+    coords[i + 1]), i.e., after every add / remove event at coords[i].
+
+    Events are ordered as NetList.max_density inserts them (nets in order,
+    a net's add before its remove); last_add[i] tells whether the last one
+    at coords[i] is an add, only such coordinates can start a peak. Built by
+    one sort of the endpoints and a cumsum, exact for Decimal (object) and
+    fixed-point (int64) columns.
+    """
+
+    def __init__(self, minx, maxx, width):
+        minx, maxx, width = np.asarray(minx), np.asarray(maxx), np.asarray(width)
+        # events in insertion order: the add of net i is 2i, its remove 2i + 1
+        x = np.stack([minx, maxx], axis=1).ravel()
+        w = np.stack([width, -width], axis=1).ravel()
+        if len(x) == 0:
+            self.coords, self.density = x, w
+            self.last_add = np.zeros(0, dtype=bool)
+            return
+
+        # stable: events at a coordinate stay in insertion order
+        order, starts = sorted_runs(x)
+        ends = np.append(starts[1:], len(x))
+        # the first event's coordinate, as the key of a dict of events
+        self.coords = x[order[starts]]
+        self.density = np.cumsum(np.add.reduceat(w[order], starts))
+        self.last_add = order[ends - 1] % 2 == 0
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def max_density(self):
+        """same as NetList.max_density()"""
+        peak = self.density[self.last_add & (self.density > 0)]
+        if len(peak) == 0:
+            return 0
+        peak = peak.max()
+        return peak.item() if isinstance(peak, np.generic) else peak
+
+    def zones(self) -> list[tuple]:
+        """same as NetList.max_density_zones()"""
+        max_density = 0
+        start_x = None
+        zones = []
+        for x, density, is_add in zip(
+            self.coords.tolist(), self.density.tolist(), self.last_add.tolist()
+        ):
+            # no overlapped nets
+            if not density > 0:
+                continue
+            if is_add:
+                if max_density < density:
+                    max_density = density
+                    start_x = x
+                    zones = []
+                elif max_density == density:
+                    start_x = x
+            elif not start_x is None:
+                zones.append((start_x, x))
+                start_x = None
+        return zones
@@ -1,11 +1,24 @@
 from decimal import Decimal
-from dataclasses import dataclass, field
-from functools import cached_property
-from collections import defaultdict, UserList
+from dataclasses import dataclass, FrozenInstanceError
+from functools import cached_property, total_ordering
+from collections import UserList
 import bisect
+from routing.segtree import RangeMaxTree
+from routing.coordinates import CoordinateIndex
+from routing.density import DensityProfile
 
 
-@dataclass(frozen=True, order=True)
+def half(v):
+    # keep fixed-point (int) coordinates integral; Decimal halves as before
+    if isinstance(v, int):
+        q, r = divmod(v, 2)
+        if r == 0:
+            return q
+        return Decimal(v) / 2
+    return v / 2
+
+
+@dataclass(frozen=True, order=True, slots=True)
 class Pin:
     x: Decimal
     y: Decimal
@@ -17,85 +30,177 @@ class Pin:
         return dict(x=str(self.x), y=str(self.y))
 
 
-@dataclass(frozen=True, order=True)
+# one object per distinct width; widths come from a small set (e.g., 1-4), so
+# only the first MAX_WIDTHS distinct ones are kept (Decimal has no weakref)
+MAX_WIDTHS = 64
+_widths = {}
+
+
+def intern_width(width):
+    # keyed by repr too, Decimal("1") and Decimal("1.0") are equal
+    key = (type(width), str(width))
+    interned = _widths.get(key)
+    if interned is None:
+        if len(_widths) >= MAX_WIDTHS:
+            return width
+        interned = _widths[key] = width
+    return interned
+
+
+class cached_slot:
+    """cached_property for a __slots__ class: the value is kept in _<name>"""
+
+    def __init__(self, func):
+        self.func = func
+
+    def __set_name__(self, owner, name: str):
+        self.slot = getattr(owner, f"_{name}")
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        try:
+            return self.slot.__get__(obj, owner)
+        except AttributeError:
+            value = self.func(obj)
+            self.slot.__set__(obj, value)
+            return value
+
+
+def _net(name, x, y, width, priority):
+    return Net.from_coords(name, x, y, width, priority)
+
+
+@total_ordering
 class Net:
-    name: str
-    pins: list[Pin] = field(default_factory=list, compare=False)
-    width: Decimal = field(default=None, compare=False)
-    priority: float = field(default=None, compare=False)  # for ccap
+    """
+    Immutable net, equal and ordered by name.
+
+    Pin coordinates are kept as two tuples x, y (pin order) instead of Pin
+    objects; pins builds Pins on access. minx / maxx are set at
+    construction, the y geometry (sorted_y, prefix_y, midy) on first use,
+    all in slots. Widths are interned.
+
+    Per net of p pins (64-bit CPython, ~120 bytes per Decimal): 112 bytes
+    of net, 2 * (40 + 8p) of tuples and 2p coordinates, i.e., ~1.5 KB with
+    the name at p = 5 (~2.0 KB as dataclasses with Pin objects). Routing
+    adds sorted_y, prefix_y and midy, ~0.9 KB at p = 5 (~1.4 KB before).
+    """
+
+    __slots__ = (
+        "name",
+        "x",
+        "y",
+        "width",
+        "priority",
+        "minx",
+        "maxx",
+        "_sorted_y",
+        "_prefix_y",
+        "_midy",
+    )
 
-    def update_priority(self, new_priority):
-        return Net(
-            name=self.name,
-            pins=self.pins,
-            width=self.width,
-            priority=new_priority,
+    def __init__(
+        self,
+        name: str,
+        pins: list[Pin] = (),
+        width: Decimal = None,
+        priority: float = None,  # for ccap
+    ):
+        self._set(
+            name,
+            tuple(p.x for p in pins),
+            tuple(p.y for p in pins),
+            width,
+            priority,
         )
 
-    @property
-    def x(self) -> list[Decimal]:
-        return [p.x for p in self.pins]
+    @classmethod
+    def from_coords(
+        cls, name: str, x: tuple, y: tuple, width: Decimal = None, priority=None
+    ):
+        """net of the pins (x[i], y[i]) without Pin objects"""
+        net = cls.__new__(cls)
+        net._set(name, tuple(x), tuple(y), width, priority)
+        return net
+
+    def _set(self, name, x, y, width, priority) -> None:
+        setattr = object.__setattr__
+        setattr(self, "name", name)
+        setattr(self, "x", x)
+        setattr(self, "y", y)
+        setattr(self, "width", intern_width(width))
+        setattr(self, "priority", priority)
+        if len(x) > 0:
+            setattr(self, "minx", min(x))
+            setattr(self, "maxx", max(x))
+
+    def __setattr__(self, name: str, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __reduce__(self):
+        return _net, (self.name, self.x, self.y, self.width, self.priority)
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is self.__class__:
+            return self.name == other.name
+        return NotImplemented
+
+    def __lt__(self, other) -> bool:
+        if other.__class__ is self.__class__:
+            return self.name < other.name
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.name,))
+
+    def update_priority(self, new_priority):
+        return Net.from_coords(self.name, self.x, self.y, self.width, new_priority)
 
     @property
-    def y(self) -> list[Decimal]:
-        return [p.y for p in self.pins]
+    def pins(self) -> tuple[Pin]:
+        return tuple(map(Pin, self.x, self.y))
 
     @property
     def n_pins(self) -> int:
-        return len(self.pins)
-
-    # x coord --------------
-    @cached_property
-    def minx(self) -> Decimal:
-        return min([p.x for p in self.pins])
-
-    @cached_property
-    def maxx(self) -> Decimal:
-        return max([p.x for p in self.pins])
+        return len(self.x)
 
     # y coord --------------
-    @cached_property
+    @cached_slot
+    def sorted_y(self) -> tuple[Decimal]:
+        return tuple(sorted(self.y))
+
+    @cached_slot
+    def prefix_y(self) -> tuple[Decimal]:
+        # prefix_y[k]: sum of the k lowest pin y
+        prefix = [0]
+        for y in self.sorted_y:
+            prefix.append(prefix[-1] + y)
+        return tuple(prefix)
+
+    @property
     def miny(self) -> Decimal:
-        return min([p.y for p in self.pins])
+        return self.sorted_y[0]
 
-    @cached_property
+    @property
     def mid_bottom_y(self) -> Decimal:
-        n_pins = len(self.pins)
-        sorted_pins = sorted(self.pins, key=lambda p: p.y)
-        mid_btm_y = 0
-        if not n_pins % 2 == 0:
-            bu = n_pins // 2 + 1
-            m = sorted_pins[bu - 1]
-            mid_btm_y = m.y
-        else:
-            b = n_pins // 2
-            bottom_pin = sorted_pins[b - 1]
-            mid_btm_y = bottom_pin.y
-        return mid_btm_y
+        return self.sorted_y[(len(self.y) - 1) // 2]
 
-    @cached_property
+    @property
     def mid_upper_y(self) -> Decimal:
-        n_pins = len(self.pins)
-        sorted_pins = sorted(self.pins, key=lambda p: p.y)
-        mid_up_y = 0
-        if not n_pins % 2 == 0:
-            bu = n_pins // 2 + 1
-            m = sorted_pins[bu - 1]
-            mid_up_y = m.y
-        else:
-            u = n_pins // 2 + 1
-            upper_pin = sorted_pins[u - 1]
-            mid_up_y = upper_pin.y
-        return mid_up_y
+        return self.sorted_y[len(self.y) // 2]
 
-    @cached_property
+    @cached_slot
     def midy(self) -> Decimal:
-        mid_y = (self.mid_bottom_y + self.mid_upper_y) / 2
+        mid_y = half(self.mid_bottom_y + self.mid_upper_y)
         return mid_y
 
-    @cached_property
+    @property
     def maxy(self) -> Decimal:
-        return max([p.y for p in self.pins])
+        return self.sorted_y[-1]
 
     # wirelength ----------------
     @property
@@ -106,10 +211,12 @@ class Net:
         if given_midy is None:
             given_midy = self.midy
 
-        ans = 0
-        for p in self.pins:
-            ans += abs(p.y - given_midy)
-        return ans
+        # k pins below given_midy, the others above
+        n_pins = len(self.y)
+        k = bisect.bisect_left(self.sorted_y, given_midy)
+        below = k * given_midy - self.prefix_y[k]
+        above = (self.prefix_y[n_pins] - self.prefix_y[k]) - (n_pins - k) * given_midy
+        return below + above
 
     def __repr__(self) -> str:
         return self.name
@@ -141,71 +248,22 @@ class NetList(UserList):
         total = sum([n.width for n in nl])
         return total
 
+    def density_profile(self) -> DensityProfile:
+        return DensityProfile(
+            [n.minx for n in self.data],
+            [n.maxx for n in self.data],
+            [n.width for n in self.data],
+        )
+
     def max_density(self):
-        diff_density = defaultdict(list)
-        for n in self.data:
-            diff_density[n.minx].append((n, "add"))
-            diff_density[n.maxx].append((n, "remove"))
-
-        _max_density = 0
-        overlapped_nets = []
-        # sort via key
-        for k, nl in sorted(diff_density.items(), key=lambda k: k[0]):
-            for t in nl:
-                net, command = t
-                if command == "add":
-                    overlapped_nets.append(net)
-                else:
-                    overlapped_nets.remove(net)
-
-            if overlapped_nets == []:
-                continue
-            density = self.sum_height(overlapped_nets)
-            if command == "add":
-                if _max_density < density:
-                    _max_density = density
-        return _max_density
+        # max density over the coordinates whose last event is an add
+        return self.density_profile().max_density()
 
     def max_density_zones(self) -> list[tuple]:
-        diff_density = defaultdict(list)
-        for n in self.data:
-            diff_density[n.minx].append((n, "add"))
-            diff_density[n.maxx].append((n, "remove"))
-
-        max_density = 0
-        start_x = None
-        zones = []
-        overlapped_nets = []
-        # sort via key
-        for k, nl in sorted(diff_density.items(), key=lambda k: k[0]):
-            # print(k)
-            for t in nl:
-                net, command = t
-                if command == "add":
-                    overlapped_nets.append(net)
-                else:
-                    overlapped_nets.remove(net)
-
-            if overlapped_nets == []:
-                continue
-
-            density = self.sum_height(overlapped_nets)
-            if command == "add":
-                if max_density < density:
-                    max_density = density
-                    start_x = k
-                    zones = []
-                elif max_density == density:
-                    start_x = k
-            else:
-                if not start_x is None:
-                    z = (start_x, k)
-                    zones.append(z)
-                    start_x = None
-        return zones
-
-
-@dataclass(frozen=True, order=True)
+        return self.density_profile().zones()
+
+
+@dataclass(frozen=True, order=True, slots=True)
 class Assignment:
     net: Net
     max_height: Decimal
@@ -221,34 +279,44 @@ class Gap:
         id: int = None,
         width: Decimal = None,
         base_height: Decimal = None,
+        fixed_point: bool = False,
+        coords: CoordinateIndex = None,
     ):
         self.id = id
         # if None, unlimited
         self.width = width
-        if not width is None:
+        # fixed-point widths are already integers in the netlist unit
+        if not width is None and not fixed_point:
             self.width = Decimal(str(width))
         self.base_height = base_height
-        self.x_coords = sorted(set([x for n in netlist for x in n.x]))
-        self.assignments = dict([(x, []) for x in self.x_coords])
+        # net endpoints, shared by the gaps of a netlist if given
+        if coords is None:
+            coords = CoordinateIndex(netlist)
+        self.coords = coords
+        # stacked height over x_coords; each assignment is kept once in net2assignment
+        # (int heights in fixed-point mode, so the arithmetic stays integral)
+        zero = 0 if fixed_point else Decimal("0.0")
+        self.heights = RangeMaxTree(len(self.coords), zero)
         self.net2assignment = {}
 
+    @property
+    def x_coords(self) -> list[Decimal]:
+        return self.coords.coords
+
     @cached_property
     def midy(self):
-        return self.base_height + self.width / 2
+        return self.base_height + half(self.width)
 
     def max_height(self, x: Decimal) -> Decimal:
-        if self.assignments[x] == []:
-            return Decimal("0.0")
-        return self.assignments[x][-1].max_height
+        # the slot of a net endpoint; 0 (nothing recorded) for any other x
+        return self.max_height_range(x, x)
 
     def update_max_height(self, height: Decimal, net: Net) -> Decimal:
         updated_height = height + net.width
         return updated_height
 
-    def range_x(self, minx: float, maxx: float) -> list[float]:
-        l = bisect.bisect_left(self.x_coords, minx)
-        r = bisect.bisect_right(self.x_coords, maxx)
-        return self.x_coords[l:r]
+    def range_index(self, minx: float, maxx: float) -> tuple[int, int]:
+        return self.coords.range_index(minx, maxx)
 
     def max_height_range(self, minx: float = None, maxx: float = None) -> Decimal:
         if minx is None:
@@ -256,12 +324,7 @@ class Gap:
         if maxx is None:
             maxx = float("inf")
 
-        max_h = Decimal("0.0")
-        for x in self.range_x(minx, maxx):
-            h = self.max_height(x)
-            if h > max_h:
-                max_h = h
-        return max_h
+        return self.heights.max(*self.range_index(minx, maxx))
 
     def is_assignable(self, net: Net, height_limit: Decimal = None) -> bool:
         if height_limit is None:
@@ -271,27 +334,17 @@ class Gap:
         if height_limit is None:
             return True
 
-        height = self.max_height_range(net.minx, net.maxx)
+        height = self.heights.max(*self.coords.span(net))
         new_height = self.update_max_height(height, net)
         return new_height <= height_limit
 
     def assign(self, net: Net) -> None:
-        if not self.is_assignable(net):
+        l, r = self.coords.span(net)
+        updated_max_h = self.update_max_height(self.heights.max(l, r), net)
+        # new assignment does not surpass the max channel hegiht
+        if not self.width is None and updated_max_h > self.width:
             raise ValueError(f"Given Net {net} is not assignable.")
 
-        assign_nets = []
-        assign_nets.extend([net])
-
-        new_assignment = []
-        last_max_h = self.max_height_range(assign_nets[0].minx, assign_nets[0].maxx)
-        for n in assign_nets:
-            updated_max_h = self.update_max_height(last_max_h, n)
-            assignment = Assignment(n, updated_max_h)
-            # register assignment
-            self.net2assignment[net.name] = assignment
-            new_assignment.append(assignment)
-            last_max_h = updated_max_h
-
-        # new assignment does not surpass the max channel hegiht
-        for x in self.range_x(net.minx, net.maxx):
-            self.assignments[x].extend(new_assignment)
+        # register assignment
+        self.net2assignment[net.name] = Assignment(net, updated_max_h)
+        self.heights.assign(l, r, updated_max_h)
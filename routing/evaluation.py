@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+import numpy as np
+from routing import entities
+
+
+@dataclass
+class VerticalWirelength:
+    """
+    Vertical wirelength of a routing. Per-net arrays follow the gaps in
+    order, then net2assignment in insertion order.
+    """
+
+    names: list[str]
+    gap_index: np.ndarray  # index of the gap in the given list
+    midy: np.ndarray  # assigned mid-height
+    per_net: np.ndarray
+    per_gap: np.ndarray
+    total: object
+
+
+def vertical_wirelength(gaps: list, exact: bool = False) -> VerticalWirelength:
+    """
+    Evaluate every assigned net at once over a flat pin array.
+
+    By default pins and heights are float64. With exact=True they stay
+    Decimal (or fixed-point int) in object arrays and the per-net and total
+    sums are accumulated in the same order as summing
+    net.vertical_wirelength(assigned midy) per assignment, so the result is
+    the same value.
+    """
+    names, gap_index, midy, n_pins, pin_y = [], [], [], [], []
+    for j, g in enumerate(gaps):
+        for name, a in g.net2assignment.items():
+            net = a.net
+            names.append(name)
+            gap_index.append(j)
+            midy.append(g.base_height + a.max_height - entities.half(net.width))
+            n_pins.append(net.n_pins)
+            pin_y.extend(net.sorted_y)
+
+    dtype = object if exact else np.float64
+    midy = np.array(midy, dtype=dtype)
+    gap_index = np.array(gap_index, dtype=np.int64)
+    if len(names) == 0:
+        return VerticalWirelength(
+            names, gap_index, midy, midy, np.zeros(len(gaps), dtype=dtype), 0
+        )
+
+    n_pins = np.array(n_pins, dtype=np.int64)
+    pin_y = np.array(pin_y, dtype=dtype)
+    starts = np.cumsum(n_pins) - n_pins
+    per_net = np.add.reduceat(np.abs(pin_y - np.repeat(midy, n_pins)), starts)
+    if exact:
+        # sequential sums as the per-assignment loop
+        per_gap = np.array([0] * len(gaps), dtype=object)
+        for j, wl in zip(gap_index.tolist(), per_net.tolist()):
+            per_gap[j] += wl
+        total = 0
+        for wl in per_net.tolist():
+            total += wl
+    else:
+        per_gap = np.bincount(gap_index, weights=per_net, minlength=len(gaps))
+        total = float(per_net.sum())
+    return VerticalWirelength(names, gap_index, midy, per_net, per_gap, total)
@@ -0,0 +1,109 @@
+import argparse
+from decimal import Decimal, ROUND_HALF_EVEN, localcontext
+from routing import entities
+
+
+class FixedPoint:
+    """
+    Exact integer coordinates for the routing hot paths.
+
+    Values are stored as integer multiples of `unit` (= resolution / 2), so the
+    midpoints taken by Net.midy and Gap.midy stay integral. With the default
+    resolution every coordinate of a chip up to ~1e6 high fits in an int64.
+    A value off the resolution grid raises ValueError unless lossy is set; it
+    is then rounded to the resolution (half-even), so a routing may differ
+    from Decimal mode.
+    """
+
+    def __init__(self, resolution: Decimal = Decimal("1e-12"), lossy: bool = False):
+        self.resolution = Decimal(str(resolution))
+        self.unit = self.resolution / 2
+        self.lossy = lossy
+
+    def to_fixed(self, v) -> int:
+        # count in half-resolution units, so every coordinate is even
+        with localcontext() as ctx:
+            ctx.prec = 64
+            q = Decimal(str(v)) / self.resolution
+            i = q.to_integral_value(rounding=ROUND_HALF_EVEN)
+            if i != q and not self.lossy:
+                raise ValueError(
+                    f"{v} is not a multiple of the resolution {self.resolution}."
+                )
+            return 2 * int(i)
+
+    def to_decimal(self, v: int) -> Decimal:
+        with localcontext() as ctx:
+            ctx.prec = 64
+            return Decimal(int(v)) * self.unit
+
+    # entities ----------------
+    def net(self, n: entities.Net) -> entities.Net:
+        return entities.Net.from_coords(
+            n.name,
+            map(self.to_fixed, n.x),
+            map(self.to_fixed, n.y),
+            width=self.to_fixed(n.width),
+            priority=n.priority,
+        )
+
+    def decimal_net(self, n: entities.Net) -> entities.Net:
+        return entities.Net.from_coords(
+            n.name,
+            map(self.to_decimal, n.x),
+            map(self.to_decimal, n.y),
+            width=self.to_decimal(n.width),
+            priority=n.priority,
+        )
+
+    def netlist(self, netlist: list) -> entities.NetList:
+        return entities.NetList([self.net(n) for n in netlist])
+
+    def decimal_netlist(self, netlist: list) -> entities.NetList:
+        return entities.NetList([self.decimal_net(n) for n in netlist])
+
+    def args(self, args):
+        """copy of args with gap sizes in fixed-point units"""
+        fixed_args = argparse.Namespace(**vars(args))
+        fixed_args.gap_width = self.to_fixed(args.gap_width)
+        fixed_args.gap_interval = self.to_fixed(args.gap_interval)
+        fixed_args.fixed_point = self
+        return fixed_args
+
+    def decimal_gaps(self, gaps: list, netlist: list = None) -> list[entities.Gap]:
+        """
+        Rebuild fixed-point gaps as Decimal gaps by replaying their assignments.
+        If the original Decimal netlist is given, its nets are used as is.
+        """
+        name2net = {}
+        if not netlist is None:
+            name2net = dict((n.name, n) for n in netlist)
+
+        decimal_gaps = []
+        for g in gaps:
+            nets = [
+                name2net.get(a.net.name) or self.decimal_net(a.net)
+                for a in g.net2assignment.values()
+            ]
+            width = None if g.width is None else self.to_decimal(g.width)
+            dg = entities.Gap(
+                nets, id=g.id, width=width, base_height=self.to_decimal(g.base_height)
+            )
+            for n in nets:
+                dg.assign(n)
+            decimal_gaps.append(dg)
+        return decimal_gaps
+
+
+def same_assignments(gaps: list, other_gaps: list) -> bool:
+    if len(gaps) != len(other_gaps):
+        return False
+
+    for g1, g2 in zip(gaps, other_gaps):
+        if g1.base_height != g2.base_height:
+            return False
+        h1 = dict((name, a.max_height) for name, a in g1.net2assignment.items())
+        h2 = dict((name, a.max_height) for name, a in g2.net2assignment.items())
+        if h1 != h2:
+            return False
+    return True
@@ -0,0 +1,204 @@
+from decimal import Decimal
+from itertools import repeat
+import numpy as np
+from routing import entities, columnar
+
+MAGIC = b"TSLDMNL2"
+HEADER = np.dtype(
+    [
+        ("magic", "S8"),
+        # value kinds of pin x, pin y and widths, see KINDS
+        ("x_kind", "<u8"),
+        ("y_kind", "<u8"),
+        ("width_kind", "<u8"),
+        ("n_nets", "<u8"),
+        ("n_pins", "<u8"),
+        ("name_len", "<u8"),
+        # decimal places of kind 2 values
+        ("x_scale", "<i8"),
+        ("y_scale", "<i8"),
+        ("width_scale", "<i8"),
+    ]
+)
+# files written before the scales (all kind 2 values integral)
+HEADERS = {b"TSLDMNL1": np.dtype(HEADER.descr[:7]), MAGIC: HEADER}
+# 0: Decimal stored as float64 (exact for the reprs of generated floats)
+# 1: fixed-point int64
+# 2: Decimal d stored as the int64 d * 10**scale
+KINDS = [np.dtype("<f8"), np.dtype("<i8"), np.dtype("<i8")]
+INT64 = np.iinfo(np.int64)
+
+
+def decimal_scale(a: np.ndarray):
+    """least decimal places that make every Decimal of a an int64, or None"""
+    exponents = [d.as_tuple().exponent for d in a]
+    if any(not isinstance(e, int) for e in exponents):
+        return None  # NaN, Infinity
+    scale = max([0] + [-e for e in exponents])
+    if any(not INT64.min <= d.scaleb(scale) <= INT64.max for d in a):
+        return None
+    return scale
+
+
+def value_kind(a: np.ndarray) -> int:
+    if a.dtype == np.int64:
+        return 1
+    if a.dtype == object:
+        if all(isinstance(d, int) for d in a):
+            return 1
+        if all(isinstance(d, Decimal) for d in a) and not decimal_scale(a) is None:
+            return 2
+        if any(Decimal(repr(float(d))) != d for d in a):
+            raise ValueError("Coordinates are not representable as float64.")
+    return 0
+
+
+def value_scale(a: np.ndarray, kind: int) -> int:
+    return decimal_scale(a) if kind == 2 else 0
+
+
+def to_stored(a: np.ndarray, kind: int, scale: int = 0) -> np.ndarray:
+    """values of the routing -> array to store"""
+    if kind == 2:
+        a = [int(d.scaleb(scale)) for d in a]
+    return np.asarray(a, dtype=KINDS[kind])
+
+
+def to_values(a: np.ndarray, kind: int, scale: int = 0) -> list:
+    """stored array -> values of the routing: Decimal or fixed-point int"""
+    a = np.asarray(a).tolist()
+    if kind == 1:
+        return a
+    if kind == 2:
+        if scale == 0:
+            return list(map(Decimal, a))
+        return list(map(Decimal.scaleb, map(Decimal, a), repeat(-scale)))
+    # repr of a float is its shortest form, the same as generate_netlist
+    return list(map(Decimal, map(repr, a)))
+
+
+def write_netlist(path: str, netlist: list) -> None:
+    """
+    Binary netlist: header, then fixed-width little-endian arrays
+    pin_offset[n + 1], x_order[n], pin_x[p], pin_y[p], width[n], names[n].
+    Pins are CSR style and x_order is the nets sorted by minx (stable).
+    """
+    if isinstance(netlist, columnar.ColumnarNetList):
+        nl = netlist
+    else:
+        nl = columnar.ColumnarNetList.from_netlist(netlist)
+
+    values = [nl.pin_x, nl.pin_y, nl.width]
+    kinds = [value_kind(v) for v in values]
+    scales = [value_scale(v, kind) for v, kind in zip(values, kinds)]
+
+    names = np.array([name.encode() for name in nl.names], dtype=np.bytes_)
+    header = np.zeros(1, dtype=HEADER)
+    header[0] = (MAGIC, *kinds, len(nl), nl.n_pins(), names.dtype.itemsize, *scales)
+    x_order = np.argsort(columnar.ranks(nl.minx), kind="stable")
+    with open(path, mode="wb") as file:
+        file.write(header.tobytes())
+        file.write(nl.pin_offset.astype("<i8").tobytes())
+        file.write(x_order.astype("<i8").tobytes())
+        for v, kind, scale in zip(values, kinds, scales):
+            file.write(to_stored(v, kind, scale).tobytes())
+        file.write(names.tobytes())
+
+
+class NetListFile:
+    """
+    Read-only view of a file written by write_netlist.
+
+    The arrays are numpy.memmap, i.e., nothing is parsed or read until used.
+    columnar() / netlist() build the whole netlist; chunks() yields nets in
+    x-order a chunk at a time.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        magic = np.fromfile(path, dtype="S8", count=1)
+        if len(magic) == 0 or not magic[0] in HEADERS:
+            raise ValueError(f"Not a netlist file: {path}")
+        dtype = HEADERS[magic[0]]
+        header = dict(zip(dtype.names, np.fromfile(path, dtype=dtype, count=1)[0]))
+        n, p = int(header["n_nets"]), int(header["n_pins"])
+        name_len = int(header["name_len"])
+        self.x_kind, self.y_kind, self.width_kind = [
+            int(header[f"{k}_kind"]) for k in ("x", "y", "width")
+        ]
+        self.x_scale, self.y_scale, self.width_scale = [
+            int(header.get(f"{k}_scale", 0)) for k in ("x", "y", "width")
+        ]
+
+        offset = dtype.itemsize
+
+        def array(dtype, count: int) -> np.ndarray:
+            nonlocal offset
+            if count == 0:
+                # an empty range cannot be mapped
+                return np.zeros(0, dtype=dtype)
+            a = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+            offset += a.nbytes
+            return a
+
+        self.pin_offset = array("<i8", n + 1)
+        self.x_order = array("<i8", n)
+        self.pin_x = array(KINDS[self.x_kind], p)
+        self.pin_y = array(KINDS[self.y_kind], p)
+        self.width = array(KINDS[self.width_kind], n)
+        self.names = array(f"S{max(name_len, 1)}", n)
+
+    def __len__(self) -> int:
+        return len(self.width)
+
+    def nets(self, indices) -> list[entities.Net]:
+        indices = np.asarray(indices, dtype=np.int64)
+        starts = np.asarray(self.pin_offset[indices])
+        n_pins = np.asarray(self.pin_offset[indices + 1]) - starts
+        ends = np.cumsum(n_pins)
+        # positions of the pins of the given nets in the pin arrays
+        pin_index = np.repeat(starts - (ends - n_pins), n_pins) + np.arange(
+            ends[-1] if len(ends) > 0 else 0
+        )
+        pin_x = to_values(self.pin_x[pin_index], self.x_kind, self.x_scale)
+        pin_y = to_values(self.pin_y[pin_index], self.y_kind, self.y_scale)
+        return [
+            # trailing NULs of the names are stripped
+            entities.Net.from_coords(name.decode(), pin_x[s:e], pin_y[s:e], width)
+            for name, s, e, width in zip(
+                self.names[indices].tolist(),
+                (ends - n_pins).tolist(),
+                ends.tolist(),
+                to_values(self.width[indices], self.width_kind, self.width_scale),
+            )
+        ]
+
+    def netlist(self) -> entities.NetList:
+        return entities.NetList(self.nets(range(len(self))))
+
+    def columnar(self) -> columnar.ColumnarNetList:
+        def values(a: np.ndarray, kind: int, scale: int) -> np.ndarray:
+            dtype = np.int64 if kind == 1 else None
+            return np.array(to_values(a, kind, scale), dtype=dtype)
+
+        return columnar.ColumnarNetList(
+            names=[name.decode() for name in self.names.tolist()],
+            pin_offset=np.asarray(self.pin_offset),
+            pin_x=values(self.pin_x, self.x_kind, self.x_scale),
+            pin_y=values(self.pin_y, self.y_kind, self.y_scale),
+            width=values(self.width, self.width_kind, self.width_scale),
+            # the stored numbers keep the order of the Decimal values
+            pin_y_key=np.asarray(self.pin_y),
+        )
+
+    def chunks(self, chunk_size: int = 10000):
+        """nets sorted by minx, chunk_size nets (one NetList) at a time"""
+        for s in range(0, len(self), chunk_size):
+            yield entities.NetList(self.nets(self.x_order[s : s + chunk_size]))
+
+
+def read_netlist(path: str, as_columnar: bool = False) -> list:
+    f = NetListFile(path)
+    if as_columnar:
+        return f.columnar()
+    return f.netlist()
@@ -0,0 +1,119 @@
+import numpy as np
+from routing import entities, evaluation
+from routing.netlist_file import value_kind, value_scale, to_stored, to_values
+
+
+def save_routing(path: str, gaps: list) -> None:
+    """
+    Write a routing as columns of one .npz file.
+
+    Per net (gaps in order, then assignment order): names, gap_index,
+    max_height, midy (assigned mid-height) and wirelength; per gap: id
+    (-1 if None), base_height and width. Heights keep their exact values via
+    the value kinds of routing.netlist_file; midy and wirelength are float64.
+    """
+    wl = evaluation.vertical_wirelength(gaps)
+    max_height = [a.max_height for g in gaps for a in g.net2assignment.values()]
+    columns = dict(
+        names=np.array(wl.names, dtype=str),
+        gap_index=wl.gap_index,
+        midy=wl.midy,
+        wirelength=wl.per_net,
+        gap_id=np.array([-1 if g.id is None else g.id for g in gaps], dtype=np.int64),
+    )
+    for name, values in (
+        ("max_height", max_height),
+        ("base_height", [g.base_height for g in gaps]),
+        ("width", [g.width for g in gaps]),
+    ):
+        values = np.array(values, dtype=object)
+        kind = value_kind(values)
+        scale = value_scale(values, kind)
+        columns[name] = to_stored(values, kind, scale)
+        columns[f"{name}_kind"] = np.array(kind)
+        columns[f"{name}_scale"] = np.array(scale)
+    np.savez(path, **columns)
+
+
+class RoutingFile:
+    """
+    Routing saved by save_routing.
+
+    The columns are read on first access; a Gap is rebuilt only when it is
+    indexed, from its nets (looked up by name in the given netlist) and
+    their saved max heights, without routing them again.
+    """
+
+    def __init__(self, path: str, netlist: list = None):
+        self._npz = np.load(path)
+        self._netlist = netlist
+        self._name2net = None
+        self._gaps = {}
+        self._members = None
+        self._values = {}
+        self._columns = {}
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        # columns of the file, each read once
+        if name.startswith("_") or not name in self._npz.files:
+            raise AttributeError(name)
+        if not name in self._columns:
+            self._columns[name] = self._npz[name]
+        return self._columns[name]
+
+    def values(self, name: str) -> list:
+        """exact values of max_height, base_height or width"""
+        if not name in self._values:
+            kind = int(getattr(self, f"{name}_kind"))
+            # files without scales hold integral kind 2 values
+            scale = int(getattr(self, f"{name}_scale", 0))
+            self._values[name] = to_values(getattr(self, name), kind, scale)
+        return self._values[name]
+
+    def __len__(self) -> int:
+        return len(self.gap_id)
+
+    def __iter__(self):
+        for j in range(len(self)):
+            yield self[j]
+
+    def total_wirelength(self) -> float:
+        return float(self.wirelength.sum())
+
+    def __getitem__(self, j: int) -> entities.Gap:
+        if not j in self._gaps:
+            self._gaps[j] = self._load_gap(j)
+        return self._gaps[j]
+
+    def _load_gap(self, j: int) -> entities.Gap:
+        if self._netlist is None:
+            raise ValueError("A netlist is needed to rebuild gaps.")
+        if self._name2net is None:
+            self._name2net = dict((n.name, n) for n in self._netlist)
+            # net positions of every gap, in the saved order
+            order = np.argsort(self.gap_index, kind="stable")
+            bounds = np.searchsorted(self.gap_index[order], np.arange(len(self) + 1))
+            self._members = [order[s:e] for s, e in zip(bounds[:-1], bounds[1:])]
+
+        members = self._members[j].tolist()
+        names = self.names[members].tolist()
+        max_height = self.values("max_height")
+        max_heights = [max_height[i] for i in members]
+        nets = [self._name2net[name] for name in names]
+        gap_id = int(self.gap_id[j])
+        gap = entities.Gap(
+            nets,
+            id=None if gap_id < 0 else gap_id,
+            width=self.values("width")[j],
+            base_height=self.values("base_height")[j],
+            fixed_point=int(self.width_kind) == 1,
+        )
+        # a later assignment is higher than every earlier one in its span, so
+        # a slot ends at the height of the last net saved over it
+        heights = np.full(len(gap.coords), gap.heights.default, dtype=object)
+        for n, h in zip(nets, max_heights):
+            l, r = gap.coords.span(n)
+            heights[l:r] = h
+            gap.net2assignment[n.name] = entities.Assignment(n, h)
+        gap.heights.build(heights.tolist())
+        return gap
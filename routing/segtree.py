@@ -0,0 +1,96 @@
+class RangeMaxTree:
+    """Lazy segment tree over fixed slots with range-assign and range-max."""
+
+    def __init__(self, size: int, default=0):
+        self.size = size
+        self.default = default
+        self._log = max(size - 1, 0).bit_length()
+        self._n = 1 << self._log
+        self._d = [default] * (2 * self._n)
+        self._lz = [None] * self._n
+
+    def _update(self, k: int) -> None:
+        d = self._d
+        d[k] = d[2 * k] if d[2 * k] >= d[2 * k + 1] else d[2 * k + 1]
+
+    def _apply(self, k: int, v) -> None:
+        self._d[k] = v
+        if k < self._n:
+            self._lz[k] = v
+
+    def _push(self, k: int) -> None:
+        v = self._lz[k]
+        if v is not None:
+            self._apply(2 * k, v)
+            self._apply(2 * k + 1, v)
+            self._lz[k] = None
+
+    def _push_bounds(self, l: int, r: int) -> None:
+        for i in range(self._log, 0, -1):
+            if ((l >> i) << i) != l:
+                self._push(l >> i)
+            if ((r >> i) << i) != r:
+                self._push((r - 1) >> i)
+
+    def build(self, values: list) -> None:
+        """set slot i to values[i] for every slot, in O(size)"""
+        n = self._n
+        self._d[n:] = list(values) + [self.default] * (n - self.size)
+        self._lz = [None] * n
+        for k in range(n - 1, 0, -1):
+            self._update(k)
+
+    def get(self, p: int):
+        p += self._n
+        for i in range(self._log, 0, -1):
+            self._push(p >> i)
+        return self._d[p]
+
+    def max(self, l: int, r: int):
+        """max over slots [l, r); default if the range is empty"""
+        if l >= r:
+            return self.default
+        l += self._n
+        r += self._n
+        self._push_bounds(l, r)
+
+        d = self._d
+        ans = self.default
+        while l < r:
+            if l & 1:
+                if d[l] > ans:
+                    ans = d[l]
+                l += 1
+            if r & 1:
+                r -= 1
+                if d[r] > ans:
+                    ans = d[r]
+            l >>= 1
+            r >>= 1
+        return ans
+
+    def assign(self, l: int, r: int, v) -> None:
+        """set every slot in [l, r) to v"""
+        if l >= r:
+            return
+        l += self._n
+        r += self._n
+        self._push_bounds(l, r)
+
+        l2, r2 = l, r
+        while l < r:
+            if l & 1:
+                self._apply(l, v)
+                l += 1
+            if r & 1:
+                r -= 1
+                self._apply(r, v)
+            l >>= 1
+            r >>= 1
+        l, r = l2, r2
+
+        for i in range(1, self._log + 1):
+            if ((l >> i) << i) != l:
+                self._update(l >> i)
+            if ((r >> i) << i) != r:
+                self._update((r - 1) >> i)
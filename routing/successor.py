@@ -0,0 +1,53 @@
+import bisect
+
+
+class SuccessorIndex:
+    """
+    Nets sorted by minx with deletion.
+
+    first_after(x) is the position of the first alive net whose minx > x,
+    found by bisect plus a union-find over deleted positions, so a Left-Edge
+    sweep jumps over assigned and overlapped nets instead of rescanning them.
+    """
+
+    def __init__(self, nets: list):
+        self.nets = sorted(nets, key=lambda n: n.minx)
+        self.minx = [n.minx for n in self.nets]
+        # _next[i]: next alive position >= i (len(nets) is a sentinel)
+        self._next = list(range(len(self.nets) + 1))
+        self._n_alive = len(self.nets)
+
+    def copy(self):
+        other = SuccessorIndex.__new__(SuccessorIndex)
+        other.nets = self.nets
+        other.minx = self.minx
+        other._next = self._next.copy()
+        other._n_alive = self._n_alive
+        return other
+
+    def __len__(self) -> int:
+        return self._n_alive
+
+    def __iter__(self):
+        i = self._find(0)
+        while i < len(self.nets):
+            yield self.nets[i]
+            i = self._find(i + 1)
+
+    def _find(self, i: int) -> int:
+        root = i
+        while self._next[root] != root:
+            root = self._next[root]
+        while self._next[i] != root:
+            self._next[i], i = root, self._next[i]
+        return root
+
+    def first_after(self, x) -> int:
+        return self._find(bisect.bisect_right(self.minx, x))
+
+    def next(self, i: int) -> int:
+        return self._find(i + 1)
+
+    def remove(self, i: int) -> None:
+        self._next[i] = i + 1
+        self._n_alive -= 1
@@ -0,0 +1,110 @@
+import os
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from collections import Counter, defaultdict
+
+
+class Tracer:
+    """
+    Timers and counters of a routing run.
+
+    span(name, **args) times a phase; every span becomes a complete event of
+    the Chrome trace-event format (chrome://tracing, Perfetto) whose args
+    also hold the counter increments made inside the span.
+    count(name, n) adds to a counter. counted(name, f) and scan(name, it)
+    wrap a function / iterable to count calls / items. Span args are kept
+    as given (e.g., Decimal) and only stringified by save_chrome_trace.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.counters = Counter()
+        self.total_time = defaultdict(float)
+        self.n_calls = Counter()
+        self.events = []
+        self._origin = time.perf_counter()
+
+    def __bool__(self) -> bool:
+        return self.enabled
+
+    @contextmanager
+    def span(self, name: str, **args):
+        counters = self.counters.copy()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.total_time[name] += end - start
+            self.n_calls[name] += 1
+            args.update(self.counters - counters)
+            self.events.append(
+                dict(
+                    name=name,
+                    ph="X",
+                    ts=(start - self._origin) * 1e6,
+                    dur=(end - start) * 1e6,
+                    pid=os.getpid(),
+                    tid=0,
+                    args=args,
+                )
+            )
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def counted(self, name: str, f):
+        def g(*args, **kwargs):
+            self.counters[name] += 1
+            return f(*args, **kwargs)
+
+        return g
+
+    def scan(self, name: str, it):
+        for x in it:
+            self.counters[name] += 1
+            yield x
+
+    def summary(self) -> dict:
+        return dict(
+            phases=dict(
+                (name, dict(n_calls=self.n_calls[name], time=t))
+                for name, t in sorted(self.total_time.items(), key=lambda x: -x[1])
+            ),
+            counters=dict(sorted(self.counters.items())),
+        )
+
+    def save_chrome_trace(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, mode="w") as file:
+            json.dump(dict(traceEvents=self.events), file, default=str)
+
+
+class NullTracer:
+    """
+    Disabled tracer: spans are a shared no-op, wrappers return their input.
+    Hot loops check enabled before building span args or counting.
+    """
+
+    enabled = False
+    _span = nullcontext()
+
+    def __bool__(self) -> bool:
+        return self.enabled
+
+    def span(self, name: str, **args):
+        return self._span
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    def counted(self, name: str, f):
+        return f
+
+    def scan(self, name: str, it):
+        return it
+
+
+NULL = NullTracer()
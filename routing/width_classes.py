@@ -0,0 +1,29 @@
+class WidthClasses:
+    """
+    Nets of a priority-sorted netlist (wider first) split by width.
+
+    The classes keep the netlist order, so concatenated they are the
+    netlist. Widths come from a small set, so fitting(limit) drops every net
+    that cannot fit under limit by dropping whole classes.
+    """
+
+    def __init__(self, netlist: list):
+        self.classes = {}
+        for n in netlist:
+            self.classes.setdefault(n.width, []).append(n)
+
+    def __len__(self) -> int:
+        return sum(len(nets) for nets in self.classes.values())
+
+    def fitting(self, limit=None) -> list[list]:
+        """copies of the non-empty classes of width <= limit (all if None)"""
+        return [
+            list(nets)
+            for w, nets in self.classes.items()
+            if len(nets) > 0 and (limit is None or w <= limit)
+        ]
+
+    def remove(self, nets: list) -> None:
+        names = set(n.name for n in nets)
+        for w in set(n.width for n in nets):
+            self.classes[w] = [n for n in self.classes[w] if not n.name in names]
@@ -0,0 +1,89 @@
+import numpy as np
+from routing import columnar
+
+# table entries computed at a time
+CHUNK_SIZE = 1 << 20
+
+
+class WirelengthTable:
+    """
+    Vertical wirelength of every net routed at the midy of every gap.
+
+    The table is computed once, so a run with a fixed set of candidate gaps
+    (e.g., ccap) only looks values up. Rows follow the net names and columns
+    follow the Gap objects given at construction. Rows come from the nets'
+    sorted pin y and their prefix sums (as Net.vertical_wirelength) in
+    padded nets x pins matrices, a chunk of nets at a time, so no
+    pins x gaps temporary is built; memory is the nets x gaps table.
+    Decimal coordinates stay object arrays (same arithmetic, boxed).
+    """
+
+    def __init__(self, netlist: list, gaps: list):
+        self.row = dict((n.name, i) for i, n in enumerate(netlist))
+        self.col = dict((id(g), j) for j, g in enumerate(gaps))
+
+        gap_heights = np.array([g.midy for g in gaps])
+        self.gap_heights = gap_heights
+        if isinstance(netlist, columnar.ColumnarNetList):
+            self.net_heights = netlist.midy
+        else:
+            self.net_heights = np.array([n.midy for n in netlist])
+        n_nets, n_gaps = len(netlist), len(gaps)
+        if n_nets == 0 or n_gaps == 0:
+            self.table = np.zeros((n_nets, n_gaps))
+            return
+        sorted_y, prefix_y, n_pins = _padded_pins(netlist)
+        order = np.argsort(gap_heights, kind="stable")
+        heights = gap_heights[order]
+        # first gap (in height order) above each pin; padding is above all
+        first_above = np.searchsorted(heights, sorted_y.ravel(), "right")
+        first_above = first_above.reshape(sorted_y.shape)
+        first_above[np.arange(sorted_y.shape[1]) >= n_pins[:, None]] = n_gaps
+        total_y = prefix_y[np.arange(n_nets), n_pins][:, None]
+
+        self.table = None
+        step = max(1, CHUNK_SIZE // (n_gaps + 1))
+        for s in range(0, n_nets, step):
+            e = min(s + step, n_nets)
+            # k[i, j]: pins of net i below the j-th lowest gap
+            bins = np.arange(e - s)[:, None] * (n_gaps + 1) + first_above[s:e]
+            k = np.bincount(bins.ravel(), minlength=(e - s) * (n_gaps + 1))
+            k = k.reshape(e - s, n_gaps + 1)[:, :-1].cumsum(axis=1)
+            prefix_k = np.take_along_axis(prefix_y[s:e], k, axis=1)
+            below = k * heights - prefix_k
+            above = (total_y[s:e] - prefix_k) - (n_pins[s:e, None] - k) * heights
+            rows = below + above
+            if self.table is None:
+                self.table = np.empty((n_nets, n_gaps), dtype=rows.dtype)
+            self.table[s:e, order] = rows
+
+    def rows(self, netlist: list) -> np.ndarray:
+        return np.array([self.row[n.name] for n in netlist], dtype=np.int64)
+
+    def cols(self, gaps: list) -> np.ndarray:
+        return np.array([self.col[id(g)] for g in gaps], dtype=np.int64)
+
+
+def _padded_pins(netlist: list) -> tuple:
+    """
+    (sorted pin y, their prefix sums, #pins) of all nets: rows padded with
+    0 to the most pins (prefix sums to one more)
+    """
+    if isinstance(netlist, columnar.ColumnarNetList):
+        n_pins = np.diff(netlist.pin_offset)
+        pin_y = netlist.sorted_pin_y
+        sorted_y = np.zeros((len(n_pins), n_pins.max()), dtype=pin_y.dtype)
+        rows = np.repeat(np.arange(len(n_pins)), n_pins)
+        cols = np.arange(len(pin_y)) - np.repeat(netlist.pin_offset[:-1], n_pins)
+        sorted_y[rows, cols] = pin_y
+        prefix_y = np.zeros((len(n_pins), n_pins.max() + 1), dtype=pin_y.dtype)
+        prefix_y[:, 1:] = np.cumsum(sorted_y, axis=1)
+    else:
+        n_pins = np.array([len(n.sorted_y) for n in netlist], dtype=np.int64)
+        dtype = np.array([y for n in netlist for y in n.sorted_y]).dtype
+        sorted_y = np.zeros((len(n_pins), n_pins.max()), dtype=dtype)
+        prefix_y = np.zeros((len(n_pins), n_pins.max() + 1), dtype=dtype)
+        for i, n in enumerate(netlist):
+            sorted_y[i, : n_pins[i]] = n.sorted_y
+            prefix_y[i, : n_pins[i] + 1] = n.prefix_y
+    return sorted_y, prefix_y, n_pins
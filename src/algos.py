@@ -1,282 +1,425 @@
 from decimal import Decimal
-from routing import entities
+from contextlib import contextmanager
+from routing import entities, columnar, tracing
+from routing.congestion import GapCongestion, closest_gaps
+from routing.coordinates import CoordinateIndex
+from routing.density import DynamicDensity
+from routing.successor import SuccessorIndex
+from routing.width_classes import WidthClasses
+from routing.wirelength import WirelengthTable
 import numpy as np
+import bisect
+
+# instrumentation of the algorithms, disabled unless inside traced()
+tracer = tracing.NULL
+
+
+@contextmanager
+def traced(t: tracing.Tracer = None):
+    """
+    Record phase timers and operation counters of the routing run(s) inside
+    the block, e.g.,
+        with traced() as t:
+            ccap(netlist, args, n_gaps)
+        t.summary(); t.save_chrome_trace("trace.json")
+    """
+    global tracer
+    prev, tracer = tracer, tracing.Tracer() if t is None else t
+    try:
+        yield tracer
+    finally:
+        tracer = prev
+
+
+def new_gap(
+    netlist: list, args, i: int, coords: CoordinateIndex = None
+) -> entities.Gap:
+    gap_bottom = (i + 1) * args.gap_interval + i * args.gap_width
+    # args scaled by routing.fixed_point carry their FixedPoint
+    fixed_point = getattr(args, "fixed_point", None) is not None
+    return entities.Gap(
+        netlist,
+        width=args.gap_width,
+        base_height=gap_bottom,
+        fixed_point=fixed_point,
+        coords=coords,
+    )
+
+
+def unit_width(args):
+    fixed_point = getattr(args, "fixed_point", None)
+    if fixed_point is None:
+        return 1
+    return fixed_point.to_fixed(1)
 
 
 def left_edge(netlist: list, args, n_gaps: int = None):
+    t = tracer
 
+    # one endpoint index for every gap of the run
+    coords = CoordinateIndex(netlist)
     gaps = []
     if not n_gaps is None:
         for i in range(n_gaps):
-            gap_bottom = (i + 1) * args.gap_interval + i * args.gap_width
-            gap = entities.Gap(netlist, width=args.gap_width, base_height=gap_bottom)
-            gaps.append(gap)
+            gaps.append(new_gap(netlist, args, i, coords))
 
     # left edge
+    unit = unit_width(args)
+    congestion = incremental_congestion(gaps, netlist, args, unit)
     gap_count = 0
-    sorted_netlist = sorted(netlist, key=lambda x: x.minx)
+    unassigned = SuccessorIndex(netlist)
     assigned_gaps = []
-    while sorted_netlist:
+    while unassigned:
         if n_gaps is None:
-            gap_bottom = (
-                gap_count + 1
-            ) * args.gap_interval + gap_count * args.gap_width
-            gap = entities.Gap(
-                sorted_netlist, width=args.gap_width, base_height=gap_bottom
-            )
+            gap = new_gap(netlist, args, gap_count, coords)
             assigned_gaps.append(gap)
             gap_count += 1
-        else:
-            unit_width_nets = [n for n in sorted_netlist if n.width == 1]
-            calc_gap_congestion(gaps, unit_width_nets)
+        elif congestion is None:
+            with t.span("calc_gap_congestion"):
+                unit_width_nets = [n for n in unassigned if n.width == unit]
+                calc_gap_congestion(gaps, unit_width_nets)
             gaps = sorted(gaps, reverse=False, key=lambda x: x.congestion)
             gap = gaps.pop(0)
             assigned_gaps.append(gap)
+        else:
+            with t.span("calc_gap_congestion"):
+                gap = congestion.pop()
+            assigned_gaps.append(gap)
 
-        while True:
-            x = Decimal(float("-inf"))
-            remove_nets = []
-            for n in sorted_netlist:
-                if x < n.minx and gap.is_assignable(n):
-                    gap.assign(n)
-                    x = n.maxx
-                    remove_nets.append(n)
-
-            # no assignment, go to the next gap
-            if remove_nets == []:
-                break
+        # heights in a gap only grow, so a net that does not fit never will
+        candidates = unassigned.copy()
+        is_assignable = t.counted("is_assignable", gap.is_assignable)
+        with t.span("gap", gap=len(assigned_gaps) - 1):
+            while True:
+                is_updated = False
+                with t.span("round"):
+                    if t.enabled:
+                        t.count("rounds")
+                    # leftmost candidate, then the next one right of the last
+                    # assigned net
+                    i = candidates.first_after(float("-inf"))
+                    while i < len(candidates.nets):
+                        n = candidates.nets[i]
+                        candidates.remove(i)
+                        if is_assignable(n):
+                            gap.assign(n)
+                            unassigned.remove(i)
+                            is_updated = True
+                            i = candidates.first_after(n.maxx)
+                        else:
+                            i = candidates.next(i)
+
+                # no assignment, go to the next gap
+                if not is_updated:
+                    break
 
-            for n in remove_nets:
-                sorted_netlist.remove(n)
+        if not congestion is None:
+            congestion.remove_nets([a.net for a in gap.net2assignment.values()])
 
     return assigned_gaps
 
 
-def __cap_priority(net1: entities.Net, net2: entities.Net) -> int:
-    """If net1 < net2, return -1; otherwise, 1"""
-    # 1st: wider
-    if net1.width > net2.width:
-        return -1
-    elif net1.width < net2.width:
-        return 1
-
-    # 2nd: leftmost
-    if net1.minx < net2.minx:
-        return -1
+def sort_by_priority(netlist: list, priority: list = None) -> entities.NetList:
+    """
+    1st: wider, 2nd: higher criticality-priority (ccap only), 3rd: leftmost.
+    Ties keep the given order.
+    """
+    if isinstance(netlist, columnar.ColumnarNetList):
+        order = netlist.priority_order(priority)
     else:
-        return 1
+        width = [n.width for n in netlist]
+        minx = [n.minx for n in netlist]
+        order = columnar.priority_order(width, minx, priority)
+    return entities.NetList([netlist[i] for i in order])
 
 
 def is_desired_net(
     available_start_x: Decimal, density_zones: list[tuple], n: entities.Net
 ) -> bool:
-    for z in density_zones:
-        if available_start_x < z[0] and z[0] < n.minx:
-            return False
+    # zones are sorted: look at the first zone starting after available_start_x
+    i = bisect.bisect_right(density_zones, available_start_x, key=lambda z: z[0])
+    if i < len(density_zones) and density_zones[i][0] < n.minx:
+        return False
     return True
 
 
+def route_round(
+    gap: entities.Gap, classes: WidthClasses, zones: list, height_limit, is_assignable
+) -> list:
+    """
+    One round of CAP / CCAP: assign the first net in priority order that
+    starts right of the last assigned one, is desired and fits under
+    height_limit, until there is none.
+
+    Only the width classes that fit under the limit are scanned, and a net
+    is dropped for the rest of the round once it is left of x or not
+    assignable (x and gap heights only grow). Assigns as a full rescan.
+    """
+    t = tracer
+    limit = gap.width if height_limit is None else height_limit
+    candidates = classes.fitting(limit)
+    assign_nets = []
+    # compares with Decimal and fixed-point int coordinates alike
+    x = float("-inf")
+    while True:
+        # is_desired_net(x, zones, n) is n.minx <= the first zone start after x
+        i = bisect.bisect_right(zones, x, key=lambda z: z[0])
+        bound = zones[i][0] if i < len(zones) else None
+        assign_net = None
+        for c, nets in enumerate(candidates):
+            kept = []
+            for k, n in enumerate(t.scan("candidates", nets)):
+                if not x < n.minx:
+                    continue
+                if not bound is None and bound < n.minx:
+                    kept.append(n)
+                elif is_assignable(n, height_limit):
+                    assign_net = n
+                    kept.extend(nets[k + 1 :])
+                    break
+            candidates[c] = kept
+            if not assign_net is None:
+                break
+        # exhausted classes
+        candidates = [nets for nets in candidates if len(nets) > 0]
+
+        if assign_net is None:
+            break
+        x = assign_net.maxx
+        gap.assign(assign_net)
+        assign_nets.append(assign_net)
+    return assign_nets
+
+
 def cap(netlist: list, args, n_gaps: int = None) -> list:
-    from copy import deepcopy
     from collections import deque
-    from functools import cmp_to_key
 
-    sorted_netlist = deepcopy(netlist)
-    sorted_netlist.sort(key=cmp_to_key(__cap_priority))
+    t = tracer
+    # nets are immutable and shared; only the sorted list is consumed
+    with t.span("sort_by_priority"):
+        sorted_netlist = sort_by_priority(netlist)
+        density = DynamicDensity(sorted_netlist)
+        classes = WidthClasses(sorted_netlist)
 
+    coords = CoordinateIndex(netlist)
     gaps = []
     if not n_gaps is None:
         for i in range(n_gaps):
-            gap_bottom = (i + 1) * args.gap_interval + i * args.gap_width
-            gap = entities.Gap(netlist, width=args.gap_width, base_height=gap_bottom)
-            gaps.append(gap)
+            gaps.append(new_gap(netlist, args, i, coords))
 
+    unit = unit_width(args)
+    congestion = incremental_congestion(gaps, sorted_netlist, args, unit)
     gap_count = 0
     assigned_gaps = []
     height_limit_queue = deque()
-    while sorted_netlist:
+    # unassigned nets are the ones still in density
+    while len(density) > 0:
         if n_gaps is None:
-            gap_bottom = (
-                gap_count + 1
-            ) * args.gap_interval + gap_count * args.gap_width
-            gap = entities.Gap(
-                sorted_netlist, width=args.gap_width, base_height=gap_bottom
-            )
+            gap = new_gap(netlist, args, gap_count, coords)
             assigned_gaps.append(gap)
             gap_count += 1
-        else:
-            unit_width_nets = [n for n in sorted_netlist if n.width == 1]
-            calc_gap_congestion(gaps, unit_width_nets)
+        elif congestion is None:
+            with t.span("calc_gap_congestion"):
+                unit_width_nets = [
+                    n for n in sorted_netlist if n.width == unit and n in density
+                ]
+                calc_gap_congestion(gaps, unit_width_nets)
             gaps = sorted(gaps, reverse=False, key=lambda x: x.congestion)
             gap = gaps.pop(0)
             assigned_gaps.append(gap)
+        else:
+            with t.span("calc_gap_congestion"):
+                gap = congestion.pop()
+            assigned_gaps.append(gap)
 
-        while True:
-            # height limit
-            if len(height_limit_queue) == 0:
-                height_limit = None  # gap width
-            else:
-                height_limit = height_limit_queue[-1]
-
-            # run Left Edge
-            assign_nets = []
-            x = Decimal(float("-inf"))
-            # local density + zones
-            zones = sorted_netlist.max_density_zones()
-            # 条件を満たすnet集合を選択する
+        is_assignable = t.counted("is_assignable", gap.is_assignable)
+        with t.span("gap", gap=len(assigned_gaps) - 1):
             while True:
-                is_updated = False
-                for n in sorted_netlist:
-                    if all(
-                        [
-                            x < n.minx,
-                            is_desired_net(x, zones, n),
-                            gap.is_assignable(n, height_limit),
-                        ]
-                    ):
-                        assign_nets.append(n)
-                        x = n.maxx
-                        gap.assign(n)
-                        is_updated = True
-                        break
-
-                if not is_updated:
-                    break
-
-            if assign_nets == []:
-                if height_limit is None:
-                    break  # go to the next gap
+                # height limit
+                if len(height_limit_queue) == 0:
+                    height_limit = None  # gap width
                 else:
-                    # use the next height limit
-                    height_limit_queue.pop()
-                    continue
+                    height_limit = height_limit_queue[-1]
+
+                # run Left Edge
+                # local density + zones
+                with t.span("max_density_zones"):
+                    zones = density.zones()
+                # 条件を満たすnet集合を選択する
+                with t.span("round", height_limit=height_limit):
+                    if t.enabled:
+                        t.count("rounds")
+                    assign_nets = route_round(
+                        gap, classes, zones, height_limit, is_assignable
+                    )
+
+                if assign_nets == []:
+                    if height_limit is None:
+                        break  # go to the next gap
+                    else:
+                        # use the next height limit
+                        if t.enabled:
+                            t.count("height_limit_pops")
+                        height_limit_queue.pop()
+                        continue
+
+                # register height limit from routed nets in the round
+                max_heights = sorted(
+                    [gap.net2assignment[net.name].max_height for net in assign_nets],
+                    reverse=True,
+                )
+                for h in max_heights:
+                    height_limit_queue.append(h)
+
+                # delte nets
+                for n in assign_nets:
+                    density.remove(n)
+                classes.remove(assign_nets)
+                if not congestion is None:
+                    congestion.remove_nets(assign_nets)
+    return assigned_gaps
 
-            # register height limit from routed nets in the round
-            max_heights = sorted(
-                [gap.net2assignment[net.name].max_height for net in assign_nets],
-                reverse=True,
-            )
-            for h in max_heights:
-                height_limit_queue.append(h)
 
-            # delte nets
-            for n in assign_nets:
-                sorted_netlist.remove(n)
-    return assigned_gaps
+def net_column(netlist: list, attr: str) -> np.ndarray:
+    if isinstance(netlist, columnar.ColumnarNetList):
+        return getattr(netlist, attr)
+    return np.array([getattr(n, attr) for n in netlist])
 
 
-def calc_gap_congestion(gaps: list, netlist: list):
-    def get_optimal_gaps(
-        n: entities.Net, gaps: list[entities.Gap]
-    ) -> list[entities.Gap]:
-        gs = [g for g in gaps if n.mid_bottom_y <= g.midy and g.midy <= n.mid_upper_y]
-        return gs
+def incremental_congestion(
+    gaps: list, netlist: list, args, unit, reverse: bool = False, wl_table=None
+) -> GapCongestion:
+    """
+    GapCongestion of the nets of width unit (all nets if unit is None) if
+    args.incremental_cgo is set, else None: calc_gap_congestion per gap.
+    """
+    if len(gaps) == 0 or not getattr(args, "incremental_cgo", False):
+        return None
+    if not unit is None:
+        netlist = [n for n in netlist if n.width == unit]
+    return GapCongestion(gaps, netlist, reverse=reverse, wl_table=wl_table)
 
-    def get_best_gap(n: entities.Net, gaps: list[entities.Gap]) -> entities.Gap:
-        gap_heights = np.array([g.midy for g in gaps])
-        diff = np.abs(gap_heights.T - np.array([n.midy])).T
-        sorted_args_diff = np.argsort(diff)
-        first_close_idx = sorted_args_diff[0]
-        # 残りのgapが一つしかない場合には2ndは1stと同一にする
-        if len(gap_heights) == 1:
-            second_close_idx = first_close_idx
-        else:
-            second_close_idx = sorted_args_diff[1]
-
-        # extract gaps
-        first_close_gap = gaps[first_close_idx]
-        second_close_gap = gaps[second_close_idx]
-        # calc wirelength
-        first_wl = n.vertical_wirelength(first_close_gap.midy)
-        second_wl = n.vertical_wirelength(second_close_gap.midy)
-        if first_wl < second_wl:
-            return first_close_gap
-        else:
-            return second_close_gap
 
+def calc_gap_congestion(
+    gaps: list, netlist: list, wl_table: WirelengthTable = None
+):
+    """
+    Each net spreads 1 over the gaps inside its optimal interval
+    [mid_bottom_y, mid_upper_y], or over its best gap if there is none.
+    All nets are processed at once; per-gap sums keep the net order.
+    """
     # congestion初期化
     for g in gaps:
         g.congestion = 0
-
-    # opt intervalとの重なり調査
-    for n in netlist:
-        opt_gaps = get_optimal_gaps(n, gaps)
-        if opt_gaps == []:
-            best_gap = get_best_gap(n, gaps)
-            opt_gaps = [best_gap]
-
-        for g in opt_gaps:
-            g.congestion += 1 / len(opt_gaps)
-
-
-def update_criticality_priority(netlist: list, gaps: list, target_gap):
     n_nets = len(netlist)
+    if n_nets == 0 or len(gaps) == 0:
+        return
 
-    if len(gaps) == 0:
-        return np.zeros((n_nets))
-
-    net_heights = np.array([n.midy for n in netlist])
     gap_heights = np.array([g.midy for g in gaps])
-    repeat_gap_heights = np.tile(gap_heights, (n_nets, 1))
-    diff = np.abs(repeat_gap_heights.T - np.array(net_heights)).T
-    sorted_args_diff = np.argsort(diff)
-    # 1st, 2nd closest gaps
-    first_close = sorted_args_diff[:, 0]
-    if len(gap_heights) == 1:
-        # if #net remain is one, 2nd close one is equal to 1st clone one
-        second_close = first_close
-    else:
-        second_close = sorted_args_diff[:, 1]
-
-    ps = []
-    for n, g1y, g2y in zip(
-        netlist, gap_heights[first_close], gap_heights[second_close]
-    ):
-        closest_gap_wirelength = min(
-            n.vertical_wirelength(g1y), n.vertical_wirelength(g2y)
-        )
-        target_gap_wirelength = n.vertical_wirelength(target_gap.midy)
-        p = closest_gap_wirelength - target_gap_wirelength
-        # update
-        ps.append(p)
-    return ps
-
+    order = np.argsort(gap_heights, kind="stable")
+    sorted_heights = gap_heights[order]
 
-def __ccap_priority(net1: entities.Net, net2: entities.Net) -> int:
+    # opt intervalとの重なり調査
+    l = np.searchsorted(sorted_heights, net_column(netlist, "mid_bottom_y"), "left")
+    r = np.searchsorted(sorted_heights, net_column(netlist, "mid_upper_y"), "right")
+    n_opt_gaps = r - l
+    no_opt = np.flatnonzero(n_opt_gaps == 0)
+
+    # best gap: 1st or 2nd closest one, whichever gives less wirelength
+    best_gap = np.zeros(n_nets, dtype=np.int64)
+    if len(no_opt) > 0:
+        midy = net_column(netlist, "midy")[no_opt]
+        first_close, second_close = closest_gaps(gap_heights, midy)
+        if wl_table is None:
+            pin_y = np.array([y for i in no_opt for y in netlist[i].y])
+            n_pins = np.array([netlist[i].n_pins for i in no_opt])
+            starts = np.concatenate([[0], np.cumsum(n_pins)[:-1]])
+            first_y = np.repeat(gap_heights[first_close], n_pins)
+            second_y = np.repeat(gap_heights[second_close], n_pins)
+            first_wl = np.add.reduceat(np.abs(pin_y - first_y), starts)
+            second_wl = np.add.reduceat(np.abs(pin_y - second_y), starts)
+        else:
+            rows = wl_table.rows([netlist[i] for i in no_opt])
+            cols = wl_table.cols(gaps)
+            first_wl = wl_table.table[rows, cols[first_close]]
+            second_wl = wl_table.table[rows, cols[second_close]]
+        best_gap[no_opt] = np.where(first_wl < second_wl, first_close, second_close)
+
+    # one entry per (net, gap) pair in net order
+    n_entries = np.where(n_opt_gaps == 0, 1, n_opt_gaps)
+    net_idx = np.repeat(np.arange(n_nets), n_entries)
+    within = np.arange(len(net_idx)) - np.repeat(
+        np.cumsum(n_entries) - n_entries, n_entries
+    )
+    pos = np.clip(l[net_idx] + within, 0, len(gaps) - 1)
+    gap_idx = np.where(n_opt_gaps[net_idx] == 0, best_gap[net_idx], order[pos])
+    # bincount adds sequentially, i.e., in the same order as += per net
+    congestion = np.bincount(
+        gap_idx, weights=1 / n_entries[net_idx], minlength=len(gaps)
+    )
+    for g, c in zip(gaps, congestion):
+        g.congestion = float(c)
+
+
+def update_criticality_priority(
+    netlist: list,
+    gaps: list,
+    target_gap,
+    wl_table: WirelengthTable = None,
+    remaining: np.ndarray = None,
+):
     """
-    Returns:
-    int: -1 if net1 < net2; 1 otherwise
+    Wirelength at the closer of the 1st / 2nd closest remaining gaps minus
+    that at target_gap, per net. If remaining (a mask of the gaps left) is
+    given, gaps are the columns of wl_table and netlist may be an array of
+    wl_table rows, so nothing is rebuilt per gap.
     """
-    # wider one
-    if net1.width > net2.width:
-        return -1
-    elif net1.width < net2.width:
-        return 1
-
-    # criticality-priority
-    if net1.priority > net2.priority:
-        return -1
-    elif net1.priority < net2.priority:
-        return 1
+    n_nets = len(netlist)
 
-    # leftmost
-    if net1.minx < net2.minx:
-        return -1
+    if remaining is None:
+        if len(gaps) == 0 or n_nets == 0:
+            return np.zeros((n_nets))
+        if wl_table is None:
+            wl_table = WirelengthTable(netlist, gaps + [target_gap])
+        gap_heights = np.array([g.midy for g in gaps])
+        cols = wl_table.cols(gaps)
     else:
-        return 1
+        cols = np.flatnonzero(remaining)
+        if len(cols) == 0 or n_nets == 0:
+            return np.zeros((n_nets))
+        gap_heights = wl_table.gap_heights[cols]
+    if isinstance(netlist, np.ndarray):
+        rows = netlist
+        net_heights = wl_table.net_heights[rows]
+    else:
+        rows = wl_table.rows(netlist)
+        net_heights = net_column(netlist, "midy")
+    # 1st, 2nd closest gaps
+    first_close, second_close = closest_gaps(gap_heights, net_heights)
+
+    closest_gap_wirelength = np.minimum(
+        wl_table.table[rows, cols[first_close]],
+        wl_table.table[rows, cols[second_close]],
+    )
+    target_gap_wirelength = wl_table.table[rows, wl_table.col[id(target_gap)]]
+    return closest_gap_wirelength - target_gap_wirelength
 
 
 def ccap(org_netlist: list, args, n_gaps: int):
-    from copy import deepcopy
-    from functools import cmp_to_key
     from collections import deque
 
-    netlist = deepcopy(org_netlist)
+    # nets are immutable and shared; per-run state is kept by net index
+    nets = list(org_netlist)
+    index = dict((n.name, i) for i, n in enumerate(nets))
+    width = columnar.ranks(net_column(org_netlist, "width"))
+    minx = columnar.ranks(net_column(org_netlist, "minx"))
+    assigned = np.zeros(len(nets), dtype=bool)
+    # unassigned nets in the current order
+    alive = np.arange(len(nets))
+    coords = CoordinateIndex(org_netlist)
     gaps = []
     for i in range(n_gaps):
-        gap_bottom = (i + 1) * args.gap_interval + i * args.gap_width
-        gap = entities.Gap(netlist, width=args.gap_width, base_height=gap_bottom)
-        gaps.append(gap)
+        gaps.append(new_gap(nets, args, i, coords))
 
     if args.gap_order[0] == "c":
         if args.gap_order.count("cf") > 0:
@@ -301,75 +444,106 @@ def ccap(org_netlist: list, args, n_gaps: int):
     else:
         raise ValueError(f"Invalid Gap Order: {args.gap_order}")
 
+    unit = unit_width(args)
+    t = tracer
+    # gaps are fixed from here on: wirelength of every net at every gap
+    with t.span("wirelength_table"):
+        wl_table = WirelengthTable(org_netlist, gaps)
+    congestion = None
+    if args.gap_order[0] == "c":
+        congestion = incremental_congestion(
+            gaps,
+            nets,
+            args,
+            None if congestion_use_allnet else unit,
+            reverse=congestion_first,
+            wl_table=wl_table,
+        )
     height_limit_queue = deque()
     # start assignment
     assigned_gaps = []
-    while netlist:
-        if len(gaps) == 0:
+    while len(alive) > 0:
+        if len(gaps) == 0 or (not congestion is None and len(congestion) == 0):
             assigned_gaps = []
             break
 
-        if args.gap_order[0] == "c" and len(gaps) > 1:
-            if congestion_use_allnet:
-                unit_width_nets = netlist
-            else:
-                unit_width_nets = [n for n in netlist if n.width == 1]
+        # taken gaps leave the congestion heap; gaps stays the table columns
+        remaining = None
+        if not congestion is None:
+            with t.span("calc_gap_congestion"):
+                target_gap = congestion.pop()
+            remaining = congestion.alive
+        elif args.gap_order[0] == "c" and len(gaps) > 1:
+            with t.span("calc_gap_congestion"):
+                netlist = [nets[i] for i in alive]
+                if congestion_use_allnet:
+                    unit_width_nets = netlist
+                else:
+                    unit_width_nets = [n for n in netlist if n.width == unit]
 
-            calc_gap_congestion(gaps, unit_width_nets)
+                calc_gap_congestion(gaps, unit_width_nets, wl_table)
             gaps = sorted(gaps, reverse=congestion_first, key=lambda x: x.congestion)
 
-        target_gap = gaps.pop(0)
+        if congestion is None:
+            target_gap = gaps.pop(0)
         assigned_gaps.append(target_gap)
-        # calc priority
-        ps = update_criticality_priority(netlist, gaps, target_gap)
-        netlist = entities.NetList([n.update_priority(p) for n, p in zip(netlist, ps)])
-        # sorted netlist
-        netlist.sort(key=cmp_to_key(__ccap_priority))
-        while True:
-            if len(height_limit_queue) == 0:
-                height_limit = None  # channel width
-            else:
-                height_limit = height_limit_queue[-1]
-
-            assign_nets = []
-            x = Decimal(float("-inf"))
-            zones = netlist.max_density_zones()
-
-            # 1round
+        # calc priority (aligned with alive)
+        with t.span("update_criticality_priority"):
+            ps = update_criticality_priority(
+                alive, gaps, target_gap, wl_table, remaining
+            )
+        with t.span("sort_by_priority"):
+            # sorted netlist
+            alive = alive[columnar.priority_order(width[alive], minx[alive], ps)]
+            netlist = [nets[i] for i in alive]
+            density = DynamicDensity(netlist)
+            classes = WidthClasses(netlist)
+        is_assignable = t.counted("is_assignable", target_gap.is_assignable)
+        with t.span("gap", gap=len(assigned_gaps) - 1):
             while True:
-                is_updated = False
-                for n in netlist:
-                    if (
-                        x < n.minx
-                        and is_desired_net(x, zones, n)
-                        and target_gap.is_assignable(n, height_limit)
-                    ):
-                        x = n.maxx
-                        target_gap.assign(n)
-                        is_updated = True
-                        assign_nets.append(n)
-                        break
-
-                if not is_updated:
-                    break
-
-            if assign_nets == []:
-                if height_limit is None:
-                    break
+                if len(height_limit_queue) == 0:
+                    height_limit = None  # channel width
                 else:
-                    height_limit_queue.pop()
-                    continue
+                    height_limit = height_limit_queue[-1]
 
-            # register height limit
-            max_heights = sorted(
-                [target_gap.net2assignment[net.name].max_height for net in assign_nets],
-                reverse=True,
-            )
-            for h in max_heights:
-                height_limit_queue.append(h)
+                with t.span("max_density_zones"):
+                    zones = density.zones()
 
-            # assignしたnet削除
-            for n in assign_nets:
-                netlist.remove(n)
+                # 1round
+                with t.span("round", height_limit=height_limit):
+                    if t.enabled:
+                        t.count("rounds")
+                    assign_nets = route_round(
+                        target_gap, classes, zones, height_limit, is_assignable
+                    )
+
+                if assign_nets == []:
+                    if height_limit is None:
+                        break
+                    else:
+                        if t.enabled:
+                            t.count("height_limit_pops")
+                        height_limit_queue.pop()
+                        continue
+
+                # register height limit
+                max_heights = sorted(
+                    [
+                        target_gap.net2assignment[net.name].max_height
+                        for net in assign_nets
+                    ],
+                    reverse=True,
+                )
+                for h in max_heights:
+                    height_limit_queue.append(h)
+
+                # assignしたnet削除
+                for n in assign_nets:
+                    assigned[index[n.name]] = True
+                    density.remove(n)
+                classes.remove(assign_nets)
+                if not congestion is None:
+                    congestion.remove_nets(assign_nets)
+        alive = alive[~assigned[alive]]
 
     return assigned_gaps
@@ -0,0 +1,274 @@
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, resource_tracker
+import numpy as np
+from routing import columnar
+from routing.netlist_file import value_kind, value_scale, to_stored, to_values
+from src import algos
+from src.main import generate_netlist, calc_vertical_wirelength
+
+ALGOS = ["left_edge", "cap", "ccap"]
+
+
+class SharedChannels:
+    """
+    Columnar data of many channel netlists in one shared memory block.
+
+    Nets of all channels are stacked: the nets of the c-th channel are
+    net_offset[c]:net_offset[c + 1] and their pins are CSR style over
+    pin_x / pin_y as in ColumnarNetList. Only the block name and the layout
+    (a small dict) are pickled to workers.
+    """
+
+    def __init__(self, name: str, layout: dict, create: bool = False, size: int = 0):
+        if create:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        else:
+            self.shm = attach(name)
+        self.layout = layout
+        self.arrays = dict(
+            (key, np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offset))
+            for key, (dtype, shape, offset) in layout["arrays"].items()
+        )
+
+    @classmethod
+    def from_netlists(cls, netlists: list):
+        nls = [
+            nl
+            if isinstance(nl, columnar.ColumnarNetList)
+            else columnar.ColumnarNetList.from_netlist(nl)
+            for nl in netlists
+        ]
+        n_nets = [len(nl) for nl in nls]
+        n_pins = [nl.n_pins() for nl in nls]
+        pin_start = np.cumsum([0] + n_pins)
+        pin_offset = np.concatenate(
+            [[0]] + [nl.pin_offset[1:] + p for nl, p in zip(nls, pin_start)]
+        )
+        names = [name.encode() for nl in nls for name in nl.names]
+        columns = dict(
+            net_offset=np.cumsum([0] + n_nets),
+            pin_offset=pin_offset,
+            names=np.array(names, dtype=np.bytes_),
+        )
+        kinds, scales = {}, {}
+        for key in ("pin_x", "pin_y", "width"):
+            values = [v for nl in nls for v in getattr(nl, key).tolist()]
+            values = np.array(values, dtype=object)
+            kinds[key] = value_kind(values)
+            scales[key] = value_scale(values, kinds[key])
+            columns[key] = to_stored(values, kinds[key], scales[key])
+
+        # (dtype, shape, byte offset) of every array in the block
+        layout, size = dict(arrays={}, kinds=kinds, scales=scales), 0
+        for key, a in columns.items():
+            layout["arrays"][key] = (a.dtype.str, a.shape, size)
+            size += -(-a.nbytes // 8) * 8  # keep 8-byte alignment
+        channels = cls(None, layout, create=True, size=size)
+        for key, a in channels.arrays.items():
+            a[...] = columns[key]
+        return channels
+
+    def __len__(self) -> int:
+        return len(self.arrays["net_offset"]) - 1
+
+    def netlist(self, c: int) -> columnar.ColumnarNetList:
+        a = self.arrays
+        s, e = a["net_offset"][c], a["net_offset"][c + 1]
+        pin_offset = a["pin_offset"][s : e + 1]
+        ps, pe = pin_offset[0], pin_offset[-1]
+
+        def values(key: str, sl: slice) -> np.ndarray:
+            kind, scale = self.layout["kinds"][key], self.layout["scales"][key]
+            dtype = np.int64 if kind == 1 else object
+            return np.array(to_values(a[key][sl], kind, scale), dtype=dtype)
+
+        return columnar.ColumnarNetList(
+            names=[name.decode() for name in a["names"][s:e].tolist()],
+            pin_offset=pin_offset - ps,
+            pin_x=values("pin_x", slice(ps, pe)),
+            pin_y=values("pin_y", slice(ps, pe)),
+            width=values("width", slice(s, e)),
+            pin_y_key=np.array(a["pin_y"][ps:pe]),
+        )
+
+    def close(self) -> None:
+        self.arrays = {}
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.close()
+        self.shm.unlink()
+
+
+def attach(name: str) -> shared_memory.SharedMemory:
+    # the creating process owns (and unlinks) the block
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # python < 3.13
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+_channels = None
+
+
+def _init_worker(name: str, layout: dict) -> None:
+    global _channels
+    _channels = SharedChannels(name, layout)
+
+
+def shared_netlist(c: int) -> columnar.ColumnarNetList:
+    """the c-th channel in a worker started with _init_worker"""
+    return _channels.netlist(c)
+
+
+def route_channel(c: int, algo: str, settings: dict, n_gaps: int = None) -> dict:
+    args = argparse.Namespace(**settings)
+    netlist = shared_netlist(c)
+    if algo == "ccap" and n_gaps is None:
+        # as src.main: the gaps Left Edge uses
+        n_gaps = len(algos.left_edge(netlist, args))
+
+    # only the routing phase is measured
+    start = time.perf_counter()
+    if algo == "left_edge":
+        gaps = algos.left_edge(netlist, args, n_gaps)
+    elif algo == "cap":
+        gaps = algos.cap(netlist, args, n_gaps)
+    elif algo == "ccap":
+        gaps = algos.ccap(netlist, args, n_gaps)
+    else:
+        raise ValueError(f"Invalid Algo: {algo}")
+    end = time.perf_counter()
+    return dict(
+        channel=c,
+        n_gaps=len(gaps),
+        vwl=calc_vertical_wirelength(gaps),
+        time=end - start,
+    )
+
+
+def route_channels(
+    netlists: list,
+    algo: str = "left_edge",
+    gap_width=10,
+    gap_interval=10,
+    gap_order: str = "ca-unitnet",
+    n_gaps: list = None,
+    n_workers: int = None,
+) -> list[dict]:
+    """
+    Route independent channels in worker processes.
+
+    The netlists are copied once into shared memory; a task is a channel
+    index and a result is a small dict (channel, n_gaps, vwl, time), in the
+    order of the netlists. n_gaps[c] (optional) is passed to the algorithm
+    (CGO for left_edge and cap); ccap without it uses the Left Edge count.
+    """
+    if not algo in ALGOS:
+        raise ValueError(f"Invalid Algo: {algo}")
+    settings = dict(gap_width=gap_width, gap_interval=gap_interval, gap_order=gap_order)
+    if n_gaps is None:
+        n_gaps = [None] * len(netlists)
+
+    channels = SharedChannels.from_netlists(netlists)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(channels.shm.name, channels.layout),
+        ) as executor:
+            futures = [
+                executor.submit(route_channel, c, algo, settings, n_gaps[c])
+                for c in range(len(channels))
+            ]
+            return [f.result() for f in futures]
+    finally:
+        channels.unlink()
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="")
+    parser.add_argument(
+        "--algo", "-a", type=str, default="left_edge", choices=ALGOS, help="algorithm"
+    )
+    parser.add_argument(
+        "--seeds",
+        "-s",
+        type=int,
+        nargs=2,
+        default=[0, 10],
+        metavar=("START", "STOP"),
+        help="one channel per random seed in [START, STOP)",
+    )
+    parser.add_argument(
+        "--n_workers", "-j", type=int, default=None, help="the number of processes"
+    )
+    parser.add_argument(
+        "--n_nets", "-n", type=int, default=100, help="the number of nets"
+    )
+    parser.add_argument(
+        "--max_n_pins", "-p", type=int, default=8, help="the maximum numner of pins"
+    )
+    parser.add_argument("--scenario", "-c", type=int, default=1, help="scenario")
+    parser.add_argument("--gap_width", "-w", type=int, default=10, help="gap width")
+    parser.add_argument(
+        "--gap_interval", "-i", type=int, default=10, help="gap interval"
+    )
+    parser.add_argument(
+        "--gap_order",
+        "-o",
+        type=str,
+        default="ca-unitnet",
+        choices=[
+            "cf-allnet",
+            "ca-allnet",
+            "cf-unitnet",
+            "ca-unitnet",
+            "random",
+            "bottom-up",
+            "top-down",
+        ],
+        help="gap order",
+    )
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    args = get_args()
+    netlists = []
+    for seed in range(*args.seeds):
+        channel_args = argparse.Namespace(**vars(args))
+        channel_args.seed = seed
+        # same instance as src.main
+        n_gaps = len(algos.left_edge(generate_netlist(channel_args), channel_args))
+        chip_height = (n_gaps + 1) * args.gap_interval + n_gaps * args.gap_width
+        netlists.append(generate_netlist(channel_args, chip_height, as_columnar=True))
+
+    start = time.perf_counter()
+    results = route_channels(
+        netlists,
+        algo=args.algo,
+        gap_width=args.gap_width,
+        gap_interval=args.gap_interval,
+        gap_order=args.gap_order,
+        n_workers=args.n_workers,
+    )
+    end = time.perf_counter()
+
+    for seed, r in zip(range(*args.seeds), results):
+        print(
+            f"Channel: {r['channel']} (seed {seed}), #gaps: {r['n_gaps']},"
+            f" vwl: {r['vwl']:.1f}, time: {r['time']:.3f}"
+        )
+    print(f"Total #gaps: {sum(r['n_gaps'] for r in results)}")
+    print(f"Total vwl  : {sum(r['vwl'] for r in results):.1f}")
+    print(f"Wall time  : {end - start:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tracemalloc
+from datetime import datetime
+import numpy as np
+from src import algos
+from src.main import generate_netlist
+
+GAP_ORDERS = [
+    "cf-allnet",
+    "ca-allnet",
+    "cf-unitnet",
+    "ca-unitnet",
+    "random",
+    "bottom-up",
+    "top-down",
+]
+
+# name -> routing; only ccap depends on the gap order
+VARIANTS = {
+    "le": lambda netlist, args, n_gaps: algos.left_edge(netlist, args),
+    "le-cgo": lambda netlist, args, n_gaps: algos.left_edge(netlist, args, n_gaps),
+    "cap": lambda netlist, args, n_gaps: algos.cap(netlist, args),
+    "cap-cgo": lambda netlist, args, n_gaps: algos.cap(netlist, args, n_gaps),
+    "ccap": lambda netlist, args, n_gaps: algos.ccap(netlist, args, n_gaps),
+}
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="")
+    parser.add_argument("--seed", "-s", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--n_nets",
+        "-n",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 10000, 100000],
+        help="the numbers of nets to sweep",
+    )
+    parser.add_argument(
+        "--max_n_pins",
+        "-p",
+        type=int,
+        nargs="+",
+        default=[8],
+        help="the maximum numbers of pins to sweep",
+    )
+    parser.add_argument(
+        "--scenario", "-c", type=int, nargs="+", default=[1, 2], help="scenarios"
+    )
+    parser.add_argument("--gap_width", "-w", type=int, default=10, help="gap width")
+    parser.add_argument(
+        "--gap_interval", "-i", type=int, default=10, help="gap interval"
+    )
+    parser.add_argument(
+        "--gap_order",
+        "-o",
+        type=str,
+        nargs="+",
+        default=GAP_ORDERS,
+        choices=GAP_ORDERS,
+        help="gap orders for ccap",
+    )
+    parser.add_argument(
+        "--incremental_cgo",
+        action="store_true",
+        help="keep the gap congestion of CGO up to date instead of recomputing it",
+    )
+    parser.add_argument(
+        "--algos",
+        "-a",
+        type=str,
+        nargs="+",
+        default=list(VARIANTS.keys()),
+        choices=list(VARIANTS.keys()),
+        help="algorithms",
+    )
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs")
+    parser.add_argument("--repeat", "-r", type=int, default=5, help="timed runs")
+    parser.add_argument(
+        "--output", type=str, default=None, help="json file (default: outputs/bench/)"
+    )
+    args = parser.parse_args()
+    return args
+
+
+def build_instance(args) -> tuple:
+    # same instance as src.main: the chip has the gaps Left Edge uses
+    dummy_netlist = generate_netlist(args)
+    n_gaps = len(algos.left_edge(dummy_netlist, args))
+    chip_height = (n_gaps + 1) * args.gap_interval + n_gaps * args.gap_width
+    netlist = generate_netlist(args, chip_height)
+    return netlist, n_gaps
+
+
+def measure(run, warmup: int, repeat: int) -> dict:
+    for _ in range(warmup):
+        run()
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        gaps = run()
+        times.append(time.perf_counter() - start)
+
+    # peak memory in a separate run, tracemalloc slows the timed ones
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dict(
+        times=times,
+        median=float(np.median(times)),
+        p95=float(np.percentile(times, 95)),
+        peak_memory=peak,
+        n_gaps_used=len(gaps),
+    )
+
+
+def fit_exponents(results: list) -> list:
+    """slope of log(median time) over log(#nets) per algorithm and setting"""
+    groups = {}
+    for r in results:
+        key = (r["algo"], r["max_n_pins"], r["scenario"], r["gap_order"])
+        groups.setdefault(key, []).append((r["n_nets"], r["median"]))
+
+    exponents = []
+    for (algo, max_n_pins, scenario, gap_order), points in groups.items():
+        if len(points) < 2:
+            continue
+        n_nets, medians = np.array(points).T
+        slope, _ = np.polyfit(np.log(n_nets), np.log(medians), 1)
+        exponents.append(
+            dict(
+                algo=algo,
+                max_n_pins=max_n_pins,
+                scenario=scenario,
+                gap_order=gap_order,
+                exponent=float(slope),
+            )
+        )
+    return exponents
+
+
+def main():
+    args = get_args()
+    results = []
+    for scenario in args.scenario:
+        for max_n_pins in args.max_n_pins:
+            for n_nets in args.n_nets:
+                instance_args = argparse.Namespace(
+                    seed=args.seed,
+                    n_nets=n_nets,
+                    max_n_pins=max_n_pins,
+                    scenario=scenario,
+                    gap_width=args.gap_width,
+                    gap_interval=args.gap_interval,
+                    gap_order=args.gap_order[0],
+                    incremental_cgo=args.incremental_cgo,
+                )
+                netlist, n_gaps = build_instance(instance_args)
+                for algo in args.algos:
+                    gap_orders = args.gap_order if algo == "ccap" else [None]
+                    for gap_order in gap_orders:
+                        run_args = argparse.Namespace(**vars(instance_args))
+                        if not gap_order is None:
+                            run_args.gap_order = gap_order
+                        run = lambda: VARIANTS[algo](netlist, run_args, n_gaps)
+                        r = measure(run, args.warmup, args.repeat)
+                        r.update(
+                            algo=algo,
+                            n_nets=n_nets,
+                            max_n_pins=max_n_pins,
+                            scenario=scenario,
+                            gap_order=gap_order,
+                            n_gaps=n_gaps,
+                        )
+                        results.append(r)
+                        print(
+                            f"{algo:<8} c{scenario} p{max_n_pins} n{n_nets:<7}"
+                            f" {gap_order or '':<11}"
+                            f" median {r['median']:.4f}s p95 {r['p95']:.4f}s"
+                            f" peak {r['peak_memory'] / 2**20:.1f}MiB"
+                        )
+
+    exponents = fit_exponents(results)
+    print("Fitted complexity exponent")
+    for e in exponents:
+        print(
+            f"  - {e['algo']:<8} c{e['scenario']} p{e['max_n_pins']}"
+            f" {e['gap_order'] or '':<11}: {e['exponent']:.2f}"
+        )
+
+    created_at = datetime.now()
+    output = args.output
+    if output is None:
+        output = f"./outputs/bench/{created_at:%Y%m%d-%H%M%S}.json"
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, mode="w") as file:
+        json.dump(
+            dict(
+                created_at=created_at.isoformat(),
+                python=sys.version,
+                numpy=np.__version__,
+                platform=platform.platform(),
+                args=vars(args),
+                results=results,
+                exponents=exponents,
+            ),
+            file,
+            indent=2,
+        )
+    print(f"Saved: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+from routing.fixed_point import FixedPoint, same_assignments
+from src import algos
+from src.main import get_args, generate_netlist
+
+
+def main():
+    args = get_args()
+    fp = FixedPoint(lossy=args.lossy)
+    if not args.resolution is None:
+        fp = FixedPoint(args.resolution, lossy=args.lossy)
+
+    dummy_netlist = generate_netlist(args)
+    n_gaps = len(algos.left_edge(dummy_netlist, args))
+    chip_height = (n_gaps + 1) * args.gap_interval + n_gaps * args.gap_width
+    netlist = generate_netlist(args, chip_height)
+    fixed_netlist, fixed_args = fp.netlist(netlist), fp.args(args)
+
+    variants = [
+        ("Left Edge", lambda nl, a: algos.left_edge(nl, a)),
+        ("Left Edge with CGO", lambda nl, a: algos.left_edge(nl, a, n_gaps)),
+        ("CAP", lambda nl, a: algos.cap(nl, a)),
+        ("CAP with CGO", lambda nl, a: algos.cap(nl, a, n_gaps)),
+        ("CCAP", lambda nl, a: algos.ccap(nl, a, n_gaps)),
+    ]
+    print(f"Resolution: {fp.resolution}{' (lossy)' if fp.lossy else ''}")
+    is_identical = True
+    for name, run in variants:
+        decimal_gaps = run(netlist, args)
+        fixed_gaps = run(fixed_netlist, fixed_args)
+        # heights stay integral, i.e., no Decimal arithmetic in fixed-point mode
+        is_int = all(
+            type(a.max_height) is int
+            for g in fixed_gaps
+            for a in g.net2assignment.values()
+        )
+        same = same_assignments(decimal_gaps, fp.decimal_gaps(fixed_gaps, netlist))
+        is_identical = is_identical and same and is_int
+        print(
+            f"  - {name:<18}: {'identical' if same else 'DIFFERENT'}"
+            f"{'' if is_int else ' (non-int heights)'}"
+        )
+
+    if not is_identical:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
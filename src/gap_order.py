@@ -1,10 +1,23 @@
+import os
+import csv
 import math
+import time
 import argparse
-from decimal import Decimal
-from numpy.random import default_rng
-from routing import entities
-from src import algos
-from src.main import generate_netlist, calc_vertical_wirelength
+from concurrent.futures import ProcessPoolExecutor
+from src import algos, batch
+from src.main import calc_vertical_wirelength
+from src.instance import load_instance
+
+
+GAP_ORDERS = [
+    "cf-allnet",
+    "ca-allnet",
+    "cf-unitnet",
+    "ca-unitnet",
+    "random",
+    "bottom-up",
+    "top-down",
+]
 
 
 def get_args():
@@ -26,16 +39,17 @@ def get_args():
         "-o",
         type=str,
         default="ca-unitnet",
-        choices=[
-            "cf-allnet",
-            "ca-allnet",
-            "cf-unitnet",
-            "ca-unitnet",
-            "random",
-            "bottom-up",
-            "top-down",
-        ],
-        help="gap order",
+        choices=GAP_ORDERS + ["all"],
+        help="gap order (all: compare every order in parallel)",
+    )
+    parser.add_argument(
+        "--n_workers", "-j", type=int, default=None, help="the number of processes"
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        default=None,
+        help="directory of cached instances (netlist, #gaps, chip height)",
     )
     args = parser.parse_args()
     return args
@@ -44,10 +58,11 @@ def get_args():
 def main():
 
     args = get_args()
-    dummy_netlist = generate_netlist(args)
-    lb_n_gaps = math.ceil(dummy_netlist.max_density() / args.gap_width)
-    chip_height = (lb_n_gaps + 1) * args.gap_interval + lb_n_gaps * args.gap_width
-    netlist = generate_netlist(args, chip_height)
+    # the chip has as many gaps as the lower bound of the dummy netlist
+    netlist, lb_n_gaps, chip_height = load_instance(args, "lower_bound", args.cache)
+    if args.gap_order == "all":
+        compare_orders(args, netlist, lb_n_gaps, chip_height)
+        return
     # algos...
     ccap_gaps = algos.ccap(netlist, args, lb_n_gaps)
     ccap_vwl = calc_vertical_wirelength(ccap_gaps)
@@ -61,7 +76,8 @@ def main():
     print(f"  - horizontal wl: {netlist.horizontal_wirelength():.1f}")
     print(f"  - hwl/Ch/|N_in|: {netlist.horizontal_wirelength() / 1 / args.n_nets:.2f}")
     print(f"  - vertival   wl: {netlist.vertical_wirelength():.1f}")
-    lb_vwl_per_pin = netlist.vertical_wirelength() / chip_height / netlist.n_pins()
+    lb_vwl = float(netlist.vertical_wirelength())
+    lb_vwl_per_pin = lb_vwl / chip_height / netlist.n_pins()
     print(f"  - vwl/Cv/|P_in|: {lb_vwl_per_pin:.4f}")
     print(f"CCAP with {args.gap_order} gap order")
     print(f"  - #gaps used : {len(ccap_gaps)}")
@@ -71,5 +87,75 @@ def main():
     print(f"  - rate[%]      : {ccap_vwl_per_pin / lb_vwl_per_pin * 100:.0f}")
 
 
+def run_order(gap_order: str, args, n_gaps: int) -> dict:
+    # in a src.batch worker; channel 0 is the netlist
+    args = argparse.Namespace(**vars(args))
+    args.gap_order = gap_order
+    netlist = batch.shared_netlist(0)
+    start = time.perf_counter()
+    gaps = algos.ccap(netlist, args, n_gaps)
+    end = time.perf_counter()
+    return dict(
+        gap_order=gap_order,
+        n_gaps=len(gaps),
+        vwl=calc_vertical_wirelength(gaps),
+        time=end - start,
+    )
+
+
+def compare_orders(args, netlist, n_gaps: int, chip_height) -> None:
+    channels = batch.SharedChannels.from_netlists([netlist])
+    try:
+        with ProcessPoolExecutor(
+            max_workers=args.n_workers,
+            initializer=batch._init_worker,
+            initargs=(channels.shm.name, channels.layout),
+        ) as executor:
+            futures = [
+                executor.submit(run_order, gap_order, args, n_gaps)
+                for gap_order in GAP_ORDERS
+            ]
+            results = [f.result() for f in futures]
+    finally:
+        channels.unlink()
+
+    lb_vwl = float(netlist.vertical_wirelength())
+    lb_vwl_per_pin = lb_vwl / chip_height / netlist.n_pins()
+    for r in results:
+        # ccap returns no gap if the nets do not fit into n_gaps gaps
+        r["routed"] = r["n_gaps"] > 0 or len(netlist) == 0
+        r["rate"] = r["vwl"] / chip_height / netlist.n_pins() / lb_vwl_per_pin * 100
+    routed = [r for r in results if r["routed"]]
+    best = min(routed, key=lambda r: r["vwl"]) if routed else None
+
+    print(f"CCAP with {n_gaps} gaps (lower bound), seed {args.seed}")
+    print(
+        f"  {'gap order':<11} {'#gaps':>6} {'vertical wl':>14}"
+        f" {'rate[%]':>8} {'time[s]':>8}"
+    )
+    for r in results:
+        mark = "*" if r is best else " "
+        if r["routed"]:
+            print(
+                f"{mark} {r['gap_order']:<11} {r['n_gaps']:>6} {r['vwl']:>14.1f}"
+                f" {r['rate']:>8.0f} {r['time']:>8.3f}"
+            )
+        else:
+            print(f"{mark} {r['gap_order']:<11} {'-':>6} {'not routed':>14}")
+    if not best is None:
+        print(f"Best: {best['gap_order']}")
+
+    filename = f"c{args.scenario}-{args.n_nets}-s{args.seed}.csv"
+    dirname = "./outputs/gap_order/"
+    os.makedirs(dirname, exist_ok=True)
+    with open(os.path.join(dirname, filename), mode="w") as file:
+        fields = ["gap_order", "n_gaps", "vwl", "rate", "time", "routed", "best"]
+        writer = csv.DictWriter(file, fieldnames=fields)
+        writer.writeheader()
+        for r in results:
+            writer.writerow(dict(r, best=r is best))
+    print(f"Saved: {os.path.join(dirname, filename)}")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,71 @@
+import os
+import json
+import math
+import hashlib
+from routing import netlist_file
+from src import algos
+from src.main import generate_netlist
+
+# bump to invalidate cached instances when the generator changes
+VERSION = 1
+KEYS = ["seed", "n_nets", "max_n_pins", "scenario", "gap_width", "gap_interval"]
+
+
+def instance_key(args, prepass: str) -> str:
+    """content address of an instance: sha256 of its parameters"""
+    params = dict((k, getattr(args, k)) for k in KEYS)
+    params.update(version=VERSION, prepass=prepass)
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+def make_instance(args, prepass: str = "left_edge") -> tuple:
+    """
+    The netlist, #gaps and chip height of an experiment: a dummy netlist sizes
+    the chip, by the gaps Left Edge uses (prepass="left_edge", src.main) or
+    by the lower bound (prepass="lower_bound", src.gap_order), then the
+    netlist is re-generated in the chip.
+    """
+    dummy_netlist = generate_netlist(args)
+    if prepass == "left_edge":
+        n_gaps = len(algos.left_edge(dummy_netlist, args))
+    elif prepass == "lower_bound":
+        n_gaps = math.ceil(dummy_netlist.max_density() / args.gap_width)
+    else:
+        raise ValueError(f"Invalid Prepass: {prepass}")
+    chip_height = (n_gaps + 1) * args.gap_interval + n_gaps * args.gap_width
+    netlist = generate_netlist(args, chip_height)
+    return netlist, n_gaps, chip_height
+
+
+def load_instance(args, prepass: str = "left_edge", cache_dir: str = None) -> tuple:
+    """
+    make_instance through an on-disk cache (if cache_dir is given):
+    <key>.json holds #gaps and chip height, <key>.bin the netlist
+    (routing.netlist_file).
+    """
+    if cache_dir is None:
+        return make_instance(args, prepass)
+
+    key = instance_key(args, prepass)
+    path = os.path.join(cache_dir, key)
+    if os.path.exists(f"{path}.json") and os.path.exists(f"{path}.bin"):
+        with open(f"{path}.json") as file:
+            meta = json.load(file)
+        netlist = netlist_file.read_netlist(f"{path}.bin")
+        return netlist, meta["n_gaps"], meta["chip_height"]
+
+    netlist, n_gaps, chip_height = make_instance(args, prepass)
+    os.makedirs(cache_dir, exist_ok=True)
+    # write then rename, so a concurrent reader never sees a partial entry
+    tmp = f"{path}.{os.getpid()}.tmp"
+    netlist_file.write_netlist(tmp, netlist)
+    os.replace(tmp, f"{path}.bin")
+    with open(tmp, mode="w") as file:
+        params = dict((k, getattr(args, k)) for k in KEYS)
+        json.dump(
+            dict(params, prepass=prepass, n_gaps=n_gaps, chip_height=chip_height),
+            file,
+            indent=2,
+        )
+    os.replace(tmp, f"{path}.json")
+    return netlist, n_gaps, chip_height
@@ -1,8 +1,14 @@
+import os
 import math
+import json
+import time
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
+import numpy as np
 from numpy.random import default_rng
-from routing import entities
+from routing import entities, columnar, evaluation, netlist_file, result_file
+from routing.fixed_point import FixedPoint
 from src import algos
 
 
@@ -36,11 +42,64 @@ def get_args():
         ],
         help="gap order",
     )
+    parser.add_argument(
+        "--incremental_cgo",
+        action="store_true",
+        help="keep the gap congestion of CGO up to date instead of recomputing it",
+    )
+    parser.add_argument(
+        "--resolution",
+        "-r",
+        type=Decimal,
+        default=None,
+        help="route on fixed-point integer coordinates with the given resolution",
+    )
+    parser.add_argument(
+        "--lossy",
+        action="store_true",
+        help="round coordinates off the resolution grid instead of failing",
+    )
+    parser.add_argument(
+        "--trace",
+        "-t",
+        type=str,
+        default=None,
+        help="directory to save phase timers, counters and Chrome traces to",
+    )
+    parser.add_argument(
+        "--export",
+        "-e",
+        type=str,
+        default=None,
+        help="directory to save the gap assignments of every algorithm to (.npz)",
+    )
+    parser.add_argument(
+        "--n_workers",
+        "-j",
+        type=int,
+        default=None,
+        help="run the algorithms in parallel with the given number of processes",
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        default=None,
+        help="directory of cached instances (netlist, #gaps, chip height)",
+    )
+    parser.add_argument(
+        "--save", type=str, default=None, help="write the netlist to a binary file"
+    )
+    parser.add_argument(
+        "--load",
+        type=str,
+        default=None,
+        help="route a netlist binary file instead of a generated one",
+    )
     args = parser.parse_args()
     return args
 
 
-def generate_netlist(args, chip_height=None) -> list:
+def generate_netlist(args, chip_height=None, as_columnar: bool = False) -> list:
     rg = default_rng(args.seed)
     # x-coord
     x_minx_maxx_list = rg.random((args.n_nets, args.max_n_pins))
@@ -73,58 +132,68 @@ def generate_netlist(args, chip_height=None) -> list:
     widths = rg.choice(
         list(width_prob.keys()), size=args.n_nets, p=list(width_prob.values())
     )
-    netlist = entities.NetList()
-    for i, (xs, ys, width) in enumerate(
-        zip(x_minx_maxx_list, y_minx_maxx_list, widths)
-    ):
-        # 2-8 pin nets
-        n_pins = rg.choice(range(2, args.max_n_pins + 1))
-        n = entities.Net(
-            name=f"{i}",
-            pins=[
-                entities.Pin(x=Decimal(f"{x}"), y=Decimal(f"{y}"))
-                for x, y in zip(xs[:n_pins], ys[:n_pins])
-            ],
-            width=Decimal(f"{width}"),
+    # 2-8 pin nets (one vectorized draw, same stream as one draw per net)
+    n_pins = rg.choice(range(2, args.max_n_pins + 1), size=args.n_nets)
+    # first n_pins of each row, row by row
+    is_pin = np.arange(args.max_n_pins) < n_pins[:, None]
+    pin_x = to_decimals(x_minx_maxx_list[is_pin])
+    pin_y = to_decimals(y_minx_maxx_list[is_pin])
+    widths = to_decimals(widths)
+    pin_offset = np.concatenate([[0], np.cumsum(n_pins)])
+    names = [f"{i}" for i in range(args.n_nets)]
+
+    if as_columnar:
+        return columnar.ColumnarNetList(
+            names=names,
+            pin_offset=pin_offset,
+            pin_x=np.array(pin_x, dtype=object),
+            pin_y=np.array(pin_y, dtype=object),
+            width=np.array(widths, dtype=object),
+            # the floats keep the order of their Decimal reprs
+            pin_y_key=y_minx_maxx_list[is_pin],
         )
-        netlist.append(n)
-    return netlist
 
+    netlist = entities.NetList(
+        [
+            entities.Net.from_coords(name, pin_x[s:e], pin_y[s:e], width)
+            for name, s, e, width in zip(
+                names, pin_offset[:-1].tolist(), pin_offset[1:].tolist(), widths
+            )
+        ]
+    )
+    return netlist
 
-def calc_vertical_wirelength(gaps: list) -> Decimal:
-    total_wirelength = 0
-    for g in gaps:
-        for _, assignment in g.net2assignment.items():
-            net = assignment.net
-            assigned_net_midy = g.base_height + assignment.max_height - net.width / 2
-            total_wirelength += net.vertical_wirelength(given_midy=assigned_net_midy)
-    return total_wirelength
 
+def to_decimals(a: np.ndarray) -> list[Decimal]:
+    # same as Decimal(f"{x}") per element; repr of a float is its shortest form
+    return list(map(Decimal, map(repr, a.tolist())))
 
-def main():
-    args = get_args()
-    dummy_netlist = generate_netlist(args)
-    used_gaps = algos.left_edge(dummy_netlist, args)
-    n_gaps = len(used_gaps)
-    # second, re-generate netlist in the chip which has gaps used
-    chip_height = (n_gaps + 1) * args.gap_interval + n_gaps * args.gap_width
-    netlist = generate_netlist(args, chip_height)
-    # run by each algorithm
 
-    le_gaps = algos.left_edge(netlist, args)
-    le_vwl = calc_vertical_wirelength(le_gaps)
+def calc_vertical_wirelength(gaps: list, exact: bool = False):
+    # float64 sums; exact=True keeps Decimal (fixed-point int) values
+    return evaluation.vertical_wirelength(gaps, exact=exact).total
 
-    le_cgo_gaps = algos.left_edge(netlist, args, n_gaps)
-    le_cgo_vwl = calc_vertical_wirelength(le_cgo_gaps)
 
-    cap_gaps = algos.cap(netlist, args)
-    cap_vwl = calc_vertical_wirelength(cap_gaps)
+def main():
+    args = get_args()
+    if args.load is None:
+        from src.instance import load_instance
 
-    cap_cgo_gaps = algos.cap(netlist, args, n_gaps)
-    cap_cgo_vwl = calc_vertical_wirelength(cap_cgo_gaps)
+        # dummy netlist -> #gaps Left Edge uses -> netlist in the chip of the gaps
+        netlist, n_gaps, chip_height = load_instance(args, "left_edge", args.cache)
+    else:
+        # a stored netlist: the chip has the gaps Left Edge uses for it
+        netlist = netlist_file.read_netlist(args.load)
+        args.n_nets = len(netlist)
+        n_gaps = len(algos.left_edge(netlist, args))
+        chip_height = (n_gaps + 1) * args.gap_interval + n_gaps * args.gap_width
+    if not args.save is None:
+        netlist_file.write_netlist(args.save, netlist)
+    # run by each algorithm
+    route_netlist = netlist
+    if not args.resolution is None:
+        route_netlist = FixedPoint(args.resolution, lossy=args.lossy).netlist(netlist)
 
-    ccap_gaps = algos.ccap(netlist, args, n_gaps)
-    ccap_vwl = calc_vertical_wirelength(ccap_gaps)
     # results ...
     print("Input")
     print(f"  - #nets        : {args.n_nets}")
@@ -135,43 +204,107 @@ def main():
     print(f"  - horizontal wl: {netlist.horizontal_wirelength():.1f}")
     print(f"  - hwl/Ch/|N_in|: {netlist.horizontal_wirelength() / 1 / args.n_nets:.2f}")
     print(f"  - vertival   wl: {netlist.vertical_wirelength():.1f}")
-    lb_vwl_per_pin = netlist.vertical_wirelength() / chip_height / netlist.n_pins()
+    lb_vwl = float(netlist.vertical_wirelength())
+    lb_vwl_per_pin = lb_vwl / chip_height / netlist.n_pins()
 
     print(f"  - vwl/Cv/|P_in|: {lb_vwl_per_pin:.4f}")
-    print("Left Edge")
-    print(f"  - #gaps used : {len(le_gaps)}")
-    print(f"  - vertival wl: {le_vwl:.1f}")
-    le_vwl_per_pin = le_vwl / chip_height / netlist.n_pins()
-    print(f"  - vwl/Cv/|P_in|: {le_vwl_per_pin:.4f}")
-    print(f"  - rate[%]      : {le_vwl_per_pin / lb_vwl_per_pin * 100:.1f}")
-
-    print("Left Edge with CGO")
-    print(f"  - #gaps used : {len(le_cgo_gaps)}")
-    print(f"  - vertival wl: {le_cgo_vwl:.1f}")
-    le_cgo_vwl_per_pin = le_cgo_vwl / chip_height / netlist.n_pins()
-    print(f"  - vwl/Cv/|P_in|: {le_cgo_vwl_per_pin:.4f}")
-    print(f"  - rate[%]      : {le_cgo_vwl_per_pin / lb_vwl_per_pin * 100:.1f}")
-
-    print("CAP")
-    print(f"  - #gaps used : {len(cap_gaps)}")
-    print(f"  - vertival wl: {cap_vwl:.1f}")
-    cap_vwl_per_pin = cap_vwl / chip_height / netlist.n_pins()
-    print(f"  - vwl/Cv/|P_in|: {cap_vwl_per_pin:.4f}")
-    print(f"  - rate[%]      : {cap_vwl_per_pin / lb_vwl_per_pin * 100:.1f}")
-
-    print("CAP with CGO")
-    print(f"  - #gaps used : {len(cap_cgo_gaps)}")
-    print(f"  - vertival wl: {cap_cgo_vwl:.1f}")
-    cap_cgo_vwl_per_pin = cap_cgo_vwl / chip_height / netlist.n_pins()
-    print(f"  - vwl/Cv/|P_in|: {cap_cgo_vwl_per_pin:.4f}")
-    print(f"  - rate[%]      : {cap_cgo_vwl_per_pin / lb_vwl_per_pin * 100:.1f}")
-
-    print("CCAP")
-    print(f"  - #gaps used : {len(ccap_gaps)}")
-    print(f"  - vertival wl: {ccap_vwl:.1f}")
-    ccap_vwl_per_pin = ccap_vwl / chip_height / netlist.n_pins()
-    print(f"  - vwl/Cv/|P_in|: {ccap_vwl_per_pin:.4f}")
-    print(f"  - rate[%]      : {ccap_vwl_per_pin / lb_vwl_per_pin * 100:.1f}")
+
+    parallel = not args.n_workers is None and args.n_workers > 1
+
+    def report(title: str, r: dict) -> None:
+        print(title)
+        print(f"  - #gaps used : {r['n_gaps']}")
+        print(f"  - vertival wl: {r['vwl']:.1f}")
+        vwl_per_pin = r["vwl"] / chip_height / netlist.n_pins()
+        print(f"  - vwl/Cv/|P_in|: {vwl_per_pin:.4f}")
+        print(f"  - rate[%]      : {vwl_per_pin / lb_vwl_per_pin * 100:.1f}")
+        if parallel:
+            print(f"  - time[s]      : {r['time']:.3f}")
+        print(end="", flush=True)
+
+    if not parallel:
+        for variant in VARIANTS:
+            r = run_variant(variant, netlist, route_netlist, args, n_gaps)
+            report(variant[1], r)
+        return
+
+    # workers read the netlist(s) from shared memory; blocks are printed in
+    # the order of VARIANTS, each as soon as it and the ones above are done
+    from src import batch
+
+    start = time.perf_counter()
+    channels = batch.SharedChannels.from_netlists(
+        [netlist] + ([] if args.resolution is None else [route_netlist])
+    )
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(args.n_workers, len(VARIANTS)),
+            initializer=batch._init_worker,
+            initargs=(channels.shm.name, channels.layout),
+        ) as executor:
+            futures = [
+                executor.submit(run_shared_variant, variant, args, n_gaps)
+                for variant in VARIANTS
+            ]
+            for variant, future in zip(VARIANTS, futures):
+                report(variant[1], future.result())
+    finally:
+        channels.unlink()
+    print(f"Wall time[s]: {time.perf_counter() - start:.3f}")
+
+
+# (name, title, algorithm, with n_gaps)
+VARIANTS = [
+    ("le", "Left Edge", "left_edge", False),
+    ("le-cgo", "Left Edge with CGO", "left_edge", True),
+    ("cap", "CAP", "cap", False),
+    ("cap-cgo", "CAP with CGO", "cap", True),
+    ("ccap", "CCAP", "ccap", True),
+]
+
+
+def run_variant(variant: tuple, netlist: list, route_netlist: list, args, n_gaps):
+    """route one variant; #gaps, wirelength on the Decimal pins and wall time"""
+    name, _, algo, with_n_gaps = variant
+    algo = getattr(algos, algo)
+    algo_args = [n_gaps] if with_n_gaps else []
+    route_args = args
+    if not args.resolution is None:
+        fp = FixedPoint(args.resolution, lossy=args.lossy)
+        route_args = fp.args(args)
+
+    start = time.perf_counter()
+    if args.trace is None:
+        gaps = algo(route_netlist, route_args, *algo_args)
+    else:
+        with algos.traced() as t:
+            gaps = algo(route_netlist, route_args, *algo_args)
+    end = time.perf_counter()
+
+    if not args.trace is None:
+        t.save_chrome_trace(os.path.join(args.trace, f"{name}.trace.json"))
+        path = os.path.join(args.trace, f"{name}.summary.json")
+        with open(path, mode="w") as f:
+            json.dump(t.summary(), f, indent=2)
+    if not args.resolution is None:
+        # evaluate (and export) on the original Decimal pins
+        gaps = fp.decimal_gaps(gaps, netlist)
+    if not args.export is None:
+        os.makedirs(args.export, exist_ok=True)
+        result_file.save_routing(os.path.join(args.export, f"{name}.npz"), gaps)
+    vwl = calc_vertical_wirelength(gaps)
+    return dict(name=name, n_gaps=len(gaps), vwl=vwl, time=end - start)
+
+
+def run_shared_variant(variant: tuple, args, n_gaps) -> dict:
+    # in a src.batch worker: channel 0 is the netlist, 1 the fixed-point one
+    from src import batch
+
+    netlist = batch.shared_netlist(0)
+    route_netlist = netlist
+    if not args.resolution is None:
+        route_netlist = batch.shared_netlist(1)
+    return run_variant(variant, netlist, route_netlist, args, n_gaps)
 
 
 if __name__ == "__main__":
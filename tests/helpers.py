@@ -0,0 +1,33 @@
+from decimal import Decimal
+from unittest import mock
+from numpy.random import default_rng
+from routing import entities
+from src.main import get_args, generate_netlist
+
+
+def parse_args(*argv):
+    with mock.patch("sys.argv", ["main", *argv]):
+        return get_args()
+
+
+def random_netlist(seed: int, n_nets: int, chip_height=400) -> entities.NetList:
+    # as src.main generates it, up to 6 pins per net
+    args = parse_args("-s", str(seed), "-n", str(n_nets), "-p", "6")
+    return generate_netlist(args, chip_height)
+
+
+def grid_netlist(seed: int, n_nets: int, resolution: Decimal) -> entities.NetList:
+    # every coordinate on the resolution grid, so fixed-point mode is exact
+    rg = default_rng(seed)
+    netlist = entities.NetList()
+    for i in range(n_nets):
+        n_pins = int(rg.integers(2, 6))
+        x = rg.integers(0, 200, size=n_pins).tolist()
+        y = rg.integers(0, 400, size=n_pins).tolist()
+        pins = [
+            entities.Pin(x=Decimal(px) * resolution, y=Decimal(py) * resolution)
+            for px, py in zip(x, y)
+        ]
+        width = Decimal(int(rg.choice([1, 1, 1, 2, 3])))
+        netlist.append(entities.Net(name=f"{i}", pins=pins, width=width))
+    return netlist
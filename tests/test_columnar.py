@@ -0,0 +1,88 @@
+import unittest
+from functools import cmp_to_key
+from numpy.random import default_rng
+from routing import columnar, entities
+from routing.fixed_point import FixedPoint
+from tests.helpers import random_netlist
+
+
+def cap_priority(net1: entities.Net, net2: entities.Net) -> int:
+    # wider, then leftmost
+    if net1.width != net2.width:
+        return -1 if net1.width > net2.width else 1
+    return -1 if net1.minx < net2.minx else 1
+
+
+def ccap_priority(net1: entities.Net, net2: entities.Net) -> int:
+    # wider, then higher priority, then leftmost
+    if net1.width != net2.width:
+        return -1 if net1.width > net2.width else 1
+    if net1.priority != net2.priority:
+        return -1 if net1.priority > net2.priority else 1
+    return -1 if net1.minx < net2.minx else 1
+
+
+class ColumnarNetListTest(unittest.TestCase):
+    def netlists(self):
+        fp = FixedPoint(lossy=True)
+        for seed in range(3):
+            netlist = random_netlist(seed, 50)
+            yield netlist
+            yield fp.netlist(netlist)
+
+    def test_same_as_netlist(self):
+        for netlist in self.netlists():
+            c = columnar.ColumnarNetList.from_netlist(netlist)
+            self.assertEqual(len(c), len(netlist))
+            self.assertEqual(c.n_pins(), netlist.n_pins())
+            for attr in ["width", "minx", "maxx", "mid_bottom_y", "mid_upper_y"]:
+                self.assertEqual(
+                    getattr(c, attr).tolist(), [getattr(n, attr) for n in netlist]
+                )
+            self.assertEqual(c.midy.tolist(), [n.midy for n in netlist])
+            hwl = netlist.horizontal_wirelength()
+            self.assertEqual(c.horizontal_wirelength(), hwl)
+            self.assertEqual(c.vertical_wirelength(), netlist.vertical_wirelength())
+            self.assertEqual(c.max_density(), netlist.max_density())
+            self.assertEqual(c.max_density_zones(), netlist.max_density_zones())
+
+    def test_net_views(self):
+        for netlist in self.netlists():
+            c = columnar.ColumnarNetList(
+                names=[n.name for n in netlist],
+                pin_offset=columnar.ColumnarNetList.from_netlist(netlist).pin_offset,
+                pin_x=[x for n in netlist for x in n.x],
+                pin_y=[y for n in netlist for y in n.y],
+                width=[n.width for n in netlist],
+            )
+            for n, view in zip(netlist, c):
+                self.assertEqual(view.name, n.name)
+                self.assertEqual(view.x, n.x)
+                self.assertEqual(view.y, n.y)
+                self.assertEqual(view.width, n.width)
+                self.assertEqual(view.vertical_wirelength(), n.vertical_wirelength())
+
+    def test_priority_order(self):
+        rg = default_rng(0)
+        for netlist in self.netlists():
+            order = columnar.ColumnarNetList.from_netlist(netlist).priority_order()
+            expected = sorted(netlist, key=cmp_to_key(cap_priority))
+            names = [n.name for n in expected]
+            self.assertEqual([netlist[i].name for i in order], names)
+
+            # ties in priority are common (e.g., 0 for nets at their best gap)
+            priority = rg.integers(-2, 3, size=len(netlist)).tolist()
+            nets = [
+                entities.Net.from_coords(n.name, n.x, n.y, n.width, p)
+                for n, p in zip(netlist, priority)
+            ]
+            order = columnar.priority_order(
+                [n.width for n in nets], [n.minx for n in nets], priority
+            )
+            expected = sorted(nets, key=cmp_to_key(ccap_priority))
+            names = [n.name for n in expected]
+            self.assertEqual([nets[i].name for i in order], names)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from decimal import Decimal
+from fractions import Fraction
+import numpy as np
+from numpy.random import default_rng
+from routing.congestion import GapCongestion, closest_gaps
+from routing.wirelength import WirelengthTable
+from src import algos
+from tests.helpers import parse_args, random_netlist
+
+
+def naive_closest(gap_heights: np.ndarray, y) -> list:
+    # as the sort over all gaps closest_gaps replaces
+    return np.argsort(np.abs(gap_heights - y).astype(object))[:2].tolist()
+
+
+def naive_congestion(gaps: list, nets: list) -> dict:
+    # exact congestion of every gap, net by net
+    congestion = dict((id(g), Fraction(0)) for g in gaps)
+    heights = np.array([g.midy for g in gaps])
+    for n in nets:
+        opt = [g for g in gaps if n.mid_bottom_y <= g.midy <= n.mid_upper_y]
+        for g in opt:
+            congestion[id(g)] += Fraction(1, len(opt))
+        if len(opt) == 0:
+            # with one gap, the 2nd closest gap is the 1st one
+            close = naive_closest(heights, n.midy)
+            f, s = gaps[close[0]], gaps[close[-1]]
+            best = f
+            if not n.vertical_wirelength(f.midy) < n.vertical_wirelength(s.midy):
+                best = s
+            congestion[id(best)] += 1
+    return congestion
+
+
+class ClosestGapsTest(unittest.TestCase):
+    def test_same_as_naive(self):
+        rg = default_rng(0)
+        for n_gaps in [2, 3, 5, 12]:
+            # few distinct values, so many heights and distances tie
+            heights = np.array([Decimal(int(v)) for v in rg.integers(0, 8, n_gaps)])
+            ys = np.array([Decimal(int(v)) / 2 for v in rg.integers(-4, 20, 50)])
+            first_close, second_close = closest_gaps(heights, ys)
+            for y, f, s in zip(ys, first_close, second_close):
+                self.assertEqual([f, s], naive_closest(heights, y))
+
+    def test_one_gap(self):
+        first_close, second_close = closest_gaps(np.array([3.0]), np.array([0.0, 5]))
+        self.assertEqual(first_close.tolist(), [0, 0])
+        self.assertEqual(second_close.tolist(), [0, 0])
+
+
+class GapCongestionTest(unittest.TestCase):
+    def check_same(self, seed: int, n_nets: int, n_gaps: int, reverse: bool, wl: bool):
+        args = parse_args("-c", "1")
+        chip_height = (n_gaps + 1) * args.gap_interval + n_gaps * args.gap_width
+        netlist = random_netlist(seed, n_nets, chip_height)
+        gaps = [algos.new_gap(netlist, args, i) for i in range(n_gaps)]
+        wl_table = WirelengthTable(netlist, gaps) if wl else None
+        cg = GapCongestion(gaps, list(netlist), reverse=reverse, wl_table=wl_table)
+        rg = default_rng(seed)
+        alive, nets = list(gaps), list(netlist)
+        while len(alive) > 0:
+            self.assertEqual(len(cg), len(alive))
+            congestion = naive_congestion(alive, nets)
+            for g in alive:
+                self.assertEqual(cg.exact(cg.gaps.index(g)), congestion[id(g)])
+            # floats as the one-shot evaluation
+            expected = [congestion[id(g)] for g in alive]
+            algos.calc_gap_congestion(alive, nets, wl_table)
+            for g, c in zip(alive, expected):
+                self.assertAlmostEqual(g.congestion, float(c))
+
+            g = cg.pop()
+            # least (most if reverse) congested, ties to the first gap given
+            best = (max if reverse else min)(expected)
+            self.assertIs(g, alive[expected.index(best)])
+            alive.remove(g)
+            removed = [nets[i] for i in rg.permutation(len(nets))[: len(nets) // 4]]
+            cg.remove_nets(removed)
+            nets = [n for n in nets if not n in removed]
+
+    def test_same_as_naive(self):
+        for seed in range(8):
+            self.check_same(seed, 60, 1 + seed, reverse=seed % 2 == 1, wl=False)
+
+    def test_wirelength_table(self):
+        for seed in range(4):
+            self.check_same(seed, 60, 6, reverse=seed % 2 == 1, wl=True)
+
+    def test_no_nets(self):
+        args = parse_args("-c", "1")
+        gaps = [algos.new_gap([], args, i) for i in range(3)]
+        cg = GapCongestion(gaps, [])
+        self.assertEqual([cg.pop() for _ in range(3)], gaps)
+
+
+if __name__ == "__main__":
+    unittest.main()
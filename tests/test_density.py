@@ -0,0 +1,71 @@
+import unittest
+from collections import defaultdict
+from numpy.random import default_rng
+from routing.density import DynamicDensity
+from routing.fixed_point import FixedPoint
+from tests.helpers import random_netlist
+
+
+def naive_zones(netlist: list) -> list[tuple]:
+    # NetList.max_density_zones as a sweep over the overlapped nets
+    events = defaultdict(list)
+    for n in netlist:
+        events[n.minx].append((n, "add"))
+        events[n.maxx].append((n, "remove"))
+
+    max_density = 0
+    start_x = None
+    zones = []
+    overlapped = []
+    for x, es in sorted(events.items(), key=lambda e: e[0]):
+        for net, command in es:
+            if command == "add":
+                overlapped.append(net)
+            else:
+                overlapped.remove(net)
+        if overlapped == []:
+            continue
+        density = sum(n.width for n in overlapped)
+        if command == "add":
+            if max_density < density:
+                max_density, start_x, zones = density, x, []
+            elif max_density == density:
+                start_x = x
+        elif not start_x is None:
+            zones.append((start_x, x))
+            start_x = None
+    return zones
+
+
+class DynamicDensityTest(unittest.TestCase):
+    def check_removals(self, netlist: list, seed: int) -> None:
+        rg = default_rng(seed)
+        density = DynamicDensity(netlist)
+        alive = list(netlist)
+        self.assertEqual(density.zones(), naive_zones(alive))
+        while len(alive) > 0:
+            k = int(rg.integers(1, 6))
+            for i in sorted(rg.choice(len(alive), min(k, len(alive)), False))[::-1]:
+                density.remove(alive.pop(i))
+            self.assertEqual(len(density), len(alive))
+            self.assertEqual(density.zones(), naive_zones(alive))
+        self.assertEqual(density.max_density(), 0)
+
+    def test_same_as_naive(self):
+        for seed in range(4):
+            self.check_removals(random_netlist(seed, 60), seed)
+
+    def test_fixed_point(self):
+        fp = FixedPoint(lossy=True)
+        for seed in range(2):
+            self.check_removals(fp.netlist(random_netlist(seed, 60)), seed)
+
+    def test_shared_endpoints(self):
+        # few distinct x, so adds and removes meet at the same coordinates
+        netlist = random_netlist(5, 40)
+        rounded = FixedPoint("0.1", lossy=True)
+        self.check_removals(rounded.netlist(netlist), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
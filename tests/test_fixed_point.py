@@ -0,0 +1,58 @@
+import unittest
+from decimal import Decimal
+from routing import entities
+from routing.fixed_point import FixedPoint, same_assignments
+from src import algos
+from tests.helpers import parse_args, grid_netlist
+
+
+class ToFixedTest(unittest.TestCase):
+    def test_exact(self):
+        fp = FixedPoint(Decimal("0.5"))
+        for v in [Decimal("0"), Decimal("2.5"), Decimal("-1.5"), 10]:
+            q = fp.to_fixed(v)
+            self.assertIs(type(q), int)
+            self.assertEqual(q % 2, 0)
+            self.assertEqual(fp.to_decimal(q), v)
+
+    def test_off_grid_raises(self):
+        fp = FixedPoint(Decimal("0.5"))
+        with self.assertRaises(ValueError):
+            fp.to_fixed(Decimal("0.3"))
+        with self.assertRaises(ValueError):
+            fp.net(entities.Net(name="0", pins=[entities.Pin(0, 0)], width=0.25))
+
+    def test_lossy_rounds_half_even(self):
+        fp = FixedPoint(Decimal("0.5"), lossy=True)
+        self.assertEqual(fp.to_decimal(fp.to_fixed(Decimal("0.3"))), Decimal("0.5"))
+        self.assertEqual(fp.to_fixed(Decimal("0.25")), 0)
+        self.assertEqual(fp.to_fixed(Decimal("0.75")), 4)
+
+
+class RoutingTest(unittest.TestCase):
+    def test_same_assignments_as_decimal(self):
+        args = parse_args("-c", "1")
+        resolution = Decimal("0.5")
+        fp = FixedPoint(resolution)
+        for seed in range(3):
+            netlist = grid_netlist(seed, 60, resolution)
+            n_gaps = len(algos.left_edge(netlist, args))
+            variants = [
+                lambda nl, a: algos.left_edge(nl, a),
+                lambda nl, a: algos.left_edge(nl, a, n_gaps),
+                lambda nl, a: algos.cap(nl, a),
+                lambda nl, a: algos.cap(nl, a, n_gaps),
+                lambda nl, a: algos.ccap(nl, a, n_gaps),
+            ]
+            for run in variants:
+                gaps = run(netlist, args)
+                fixed_gaps = run(fp.netlist(netlist), fp.args(args))
+                for g in fixed_gaps:
+                    for a in g.net2assignment.values():
+                        self.assertIs(type(a.max_height), int)
+                decimal_gaps = fp.decimal_gaps(fixed_gaps, netlist)
+                self.assertTrue(same_assignments(gaps, decimal_gaps))
+
+
+if __name__ == "__main__":
+    unittest.main()
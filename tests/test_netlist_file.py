@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+import numpy as np
+from routing import entities, netlist_file
+from routing.fixed_point import FixedPoint
+from tests.helpers import random_netlist, grid_netlist
+
+
+def coords(netlist: list) -> list:
+    return [(n.name, n.x, n.y, n.width) for n in netlist]
+
+
+class NetListFileTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "netlist.bin")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def check_round_trip(self, netlist: list, kinds: tuple) -> None:
+        netlist_file.write_netlist(self.path, netlist)
+        f = netlist_file.NetListFile(self.path)
+        self.assertEqual((f.x_kind, f.y_kind, f.width_kind), kinds)
+        self.assertEqual(coords(f.netlist()), coords(netlist))
+        self.assertEqual(coords(f.columnar()), coords(netlist))
+        self.assertEqual(f.columnar().midy.tolist(), [n.midy for n in netlist])
+        chunks = [n for chunk in f.chunks(7) for n in chunk]
+        by_minx = sorted(netlist, key=lambda n: n.minx)
+        self.assertEqual(coords(chunks), coords(by_minx))
+
+    def test_generated(self):
+        # float reprs with up to 20 decimals: float64, integral widths: int64
+        self.check_round_trip(random_netlist(0, 300, 4000), (0, 0, 2))
+        # few nets may still fit int64 at one scale
+        self.check_round_trip(random_netlist(0, 40), (2, 2, 2))
+
+    def test_grid(self):
+        # on a 0.001 grid: int64 at scale 3
+        netlist = grid_netlist(1, 40, Decimal("0.001"))
+        self.check_round_trip(netlist, (2, 2, 2))
+        f = netlist_file.NetListFile(self.path)
+        self.assertEqual((f.x_scale, f.y_scale, f.width_scale), (3, 3, 0))
+
+    def test_fixed_point(self):
+        fp = FixedPoint(lossy=True)
+        self.check_round_trip(fp.netlist(random_netlist(2, 40)), (1, 1, 1))
+
+    def test_not_representable(self):
+        pins = [entities.Pin(x=Decimal("0.1234567890123456789012"), y=Decimal(0))]
+        netlist = [entities.Net(name="0", pins=pins, width=Decimal(1))]
+        with self.assertRaises(ValueError):
+            netlist_file.write_netlist(self.path, netlist)
+
+    def test_version_1(self):
+        # files without scales hold integral kind 2 values
+        netlist = grid_netlist(3, 20, Decimal(1))
+        netlist_file.write_netlist(self.path, netlist)
+        with open(self.path, mode="rb") as file:
+            file.seek(netlist_file.HEADER.itemsize)
+            body = file.read()
+        name_len = netlist_file.NetListFile(self.path).names.dtype.itemsize
+        header = np.zeros(1, dtype=netlist_file.HEADERS[b"TSLDMNL1"])
+        header[0] = (b"TSLDMNL1", 2, 2, 2, len(netlist), netlist.n_pins(), name_len)
+        with open(self.path, mode="wb") as file:
+            file.write(header.tobytes() + body)
+        self.assertEqual(coords(netlist_file.read_netlist(self.path)), coords(netlist))
+
+    def test_not_a_netlist(self):
+        with open(self.path, mode="wb") as file:
+            file.write(b"nothing")
+        with self.assertRaises(ValueError):
+            netlist_file.NetListFile(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
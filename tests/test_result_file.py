@@ -0,0 +1,77 @@
+import os
+import unittest
+from decimal import Decimal
+from tempfile import TemporaryDirectory
+from routing import evaluation
+from routing.fixed_point import FixedPoint
+from routing.result_file import save_routing, RoutingFile
+from src import algos
+from tests.helpers import parse_args, random_netlist, grid_netlist
+
+
+class RoutingFileTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "routing.npz")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def check_round_trip(self, netlist: list, args) -> None:
+        n_gaps = len(algos.left_edge(netlist, args))
+        for run in [
+            lambda: algos.left_edge(netlist, args),
+            lambda: algos.cap(netlist, args, n_gaps),
+            lambda: algos.ccap(netlist, args, n_gaps),
+        ]:
+            gaps = run()
+            save_routing(self.path, gaps)
+            f = RoutingFile(self.path, netlist)
+            self.assertEqual(len(f), len(gaps))
+            self.assertEqual(f.values("width"), [g.width for g in gaps])
+            self.assertEqual(f.values("base_height"), [g.base_height for g in gaps])
+            self.assertEqual(
+                f.total_wirelength(), evaluation.vertical_wirelength(gaps).total
+            )
+            for g, h in zip(gaps, f):
+                self.assertEqual(h.id, g.id)
+                self.assertEqual(h.width, g.width)
+                self.assertEqual(h.base_height, g.base_height)
+                self.assertEqual(
+                    list(h.net2assignment.items()), list(g.net2assignment.items())
+                )
+                for a in g.net2assignment.values():
+                    n = a.net
+                    self.assertEqual(
+                        h.max_height_range(n.minx, n.maxx),
+                        g.max_height_range(n.minx, n.maxx),
+                    )
+                self.assertEqual(h.max_height_range(), g.max_height_range())
+
+    def test_generated(self):
+        self.check_round_trip(random_netlist(0, 60), parse_args("-c", "1"))
+
+    def test_grid(self):
+        self.check_round_trip(
+            grid_netlist(0, 60, Decimal("0.001")), parse_args("-c", "1")
+        )
+
+    def test_fixed_point(self):
+        netlist = grid_netlist(1, 60, Decimal("0.5"))
+        fp = FixedPoint(Decimal("0.5"))
+        self.check_round_trip(fp.netlist(netlist), fp.args(parse_args("-c", "1")))
+        f = RoutingFile(self.path, fp.netlist(netlist))
+        self.assertEqual(int(f.width_kind), 1)
+        self.assertIs(type(f[0].width), int)
+
+    def test_no_netlist(self):
+        netlist = random_netlist(1, 20)
+        save_routing(self.path, algos.left_edge(netlist, parse_args("-c", "1")))
+        f = RoutingFile(self.path)
+        self.assertEqual(sorted(f.names.tolist()), sorted(n.name for n in netlist))
+        with self.assertRaises(ValueError):
+            f[0]
+
+
+if __name__ == "__main__":
+    unittest.main()
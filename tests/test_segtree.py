@@ -0,0 +1,74 @@
+import unittest
+from decimal import Decimal
+from numpy.random import default_rng
+from routing.segtree import RangeMaxTree
+
+
+class NaiveSlots:
+    # per-slot list, as the dict of per-x heights the tree replaces
+    def __init__(self, size: int, default=0):
+        self.default = default
+        self.slots = [default] * size
+
+    def assign(self, l: int, r: int, v) -> None:
+        self.slots[l:r] = [v] * (r - l)
+
+    def max(self, l: int, r: int):
+        return max(self.slots[l:r], default=self.default)
+
+
+class RangeMaxTreeTest(unittest.TestCase):
+    def check_same(self, tree: RangeMaxTree, naive: NaiveSlots) -> None:
+        size = len(naive.slots)
+        for l in range(size + 1):
+            for r in range(l, size + 1):
+                self.assertEqual(tree.max(l, r), naive.max(l, r))
+        self.assertEqual([tree.get(p) for p in range(size)], naive.slots)
+
+    def test_same_as_naive(self):
+        rg = default_rng(0)
+        for size in [1, 2, 3, 7, 8, 9, 33]:
+            tree, naive = RangeMaxTree(size), NaiveSlots(size)
+            for _ in range(60):
+                l = int(rg.integers(0, size + 1))
+                r = int(rg.integers(l, size + 1))
+                v = int(rg.integers(0, 100))
+                if rg.random() < 0.5:
+                    tree.assign(l, r, v)
+                    naive.assign(l, r, v)
+                self.assertEqual(tree.max(l, r), naive.max(l, r))
+            self.check_same(tree, naive)
+
+    def test_stacked_decimal_heights(self):
+        # heights only grow where nets are stacked, as in Gap.assign
+        rg = default_rng(1)
+        size = 20
+        zero = Decimal("0.0")
+        tree, naive = RangeMaxTree(size, zero), NaiveSlots(size, zero)
+        for _ in range(40):
+            l = int(rg.integers(0, size))
+            r = int(rg.integers(l + 1, size + 1))
+            h = tree.max(l, r) + Decimal(int(rg.integers(1, 4)))
+            tree.assign(l, r, h)
+            naive.assign(l, r, h)
+        self.check_same(tree, naive)
+
+    def test_build(self):
+        rg = default_rng(2)
+        for size in [0, 1, 5, 16, 17]:
+            values = rg.integers(0, 50, size=size).tolist()
+            tree, naive = RangeMaxTree(size), NaiveSlots(size)
+            tree.assign(0, size, 99)
+            tree.build(values)
+            naive.slots = list(values)
+            self.check_same(tree, naive)
+
+    def test_empty(self):
+        tree = RangeMaxTree(0, Decimal("0.0"))
+        self.assertEqual(tree.max(0, 0), Decimal("0.0"))
+        tree.assign(0, 0, Decimal("1"))
+        self.assertEqual(RangeMaxTree(5).max(3, 3), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from numpy.random import default_rng
+from routing.fixed_point import FixedPoint
+from routing.successor import SuccessorIndex
+from tests.helpers import random_netlist
+
+
+class NaiveSuccessor:
+    # alive flags over the nets sorted by minx, scanned linearly
+    def __init__(self, nets: list):
+        self.nets = sorted(nets, key=lambda n: n.minx)
+        self.alive = [True] * len(self.nets)
+
+    def first_after(self, x) -> int:
+        for i, n in enumerate(self.nets):
+            if self.alive[i] and n.minx > x:
+                return i
+        return len(self.nets)
+
+    def next(self, i: int) -> int:
+        for j in range(i + 1, len(self.nets)):
+            if self.alive[j]:
+                return j
+        return len(self.nets)
+
+
+class SuccessorIndexTest(unittest.TestCase):
+    def check_removals(self, netlist: list, seed: int) -> None:
+        rg = default_rng(seed)
+        index, naive = SuccessorIndex(netlist), NaiveSuccessor(netlist)
+        self.assertEqual(index.nets, naive.nets)
+        xs = sorted(set(n.minx for n in netlist) | set(n.maxx for n in netlist))
+        while len(index) > 0:
+            for x in rg.choice(len(xs), 10).tolist():
+                self.assertEqual(index.first_after(xs[x]), naive.first_after(xs[x]))
+            # remove the first alive net after a random x (or the first one)
+            i = naive.first_after(xs[int(rg.integers(len(xs)))])
+            if i == len(netlist):
+                i = naive.next(-1)
+            self.assertEqual(index.next(i), naive.next(i))
+            index.remove(i)
+            naive.alive[i] = False
+            alive = [n for n, a in zip(naive.nets, naive.alive) if a]
+            self.assertEqual(list(index), alive)
+            self.assertEqual(len(index), len(alive))
+        self.assertEqual(index.first_after(xs[0]), len(netlist))
+
+    def test_same_as_naive(self):
+        for seed in range(4):
+            self.check_removals(random_netlist(seed, 50), seed)
+
+    def test_shared_minx(self):
+        # coarse grid: many nets start at the same x
+        rounded = FixedPoint("0.05", lossy=True)
+        self.check_removals(rounded.netlist(random_netlist(7, 50)), 7)
+
+    def test_copy(self):
+        netlist = random_netlist(0, 20)
+        index = SuccessorIndex(netlist)
+        other = index.copy()
+        other.remove(other.first_after(-1))
+        self.assertEqual(len(index), 20)
+        self.assertEqual(list(index), sorted(netlist, key=lambda n: n.minx))
+        self.assertEqual(len(other), 19)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from decimal import Decimal
+from unittest import mock
+from routing import columnar, wirelength
+from routing.fixed_point import FixedPoint
+from routing.wirelength import WirelengthTable
+from src import algos
+from tests.helpers import parse_args, random_netlist, grid_netlist
+
+
+def naive_wirelength(net, y):
+    return sum(abs(p - y) for p in net.y)
+
+
+class WirelengthTableTest(unittest.TestCase):
+    def cases(self):
+        args = parse_args("-c", "1")
+        fp = FixedPoint(Decimal("0.5"))
+        for seed in range(2):
+            netlist = random_netlist(seed, 40)
+            yield netlist, [algos.new_gap(netlist, args, i) for i in range(9)]
+            # pins on the gap heights too
+            netlist = grid_netlist(seed, 40, Decimal("0.5"))
+            yield netlist, [algos.new_gap(netlist, args, i) for i in range(9)]
+            fixed = fp.netlist(netlist)
+            fixed_args = fp.args(args)
+            yield fixed, [algos.new_gap(fixed, fixed_args, i) for i in range(9)]
+
+    def check_table(self, netlist: list, gaps: list) -> None:
+        expected = [[naive_wirelength(n, g.midy) for g in gaps] for n in netlist]
+        for nl in [netlist, columnar.ColumnarNetList.from_netlist(netlist)]:
+            table = WirelengthTable(nl, gaps)
+            self.assertEqual(table.table.tolist(), expected)
+            rows, cols = table.rows(netlist[::-1]), table.cols(gaps[::-1])
+            self.assertEqual(table.table[rows][:, cols].tolist()[0], expected[-1][::-1])
+            self.assertEqual(table.net_heights.tolist(), [n.midy for n in netlist])
+            self.assertEqual(table.gap_heights.tolist(), [g.midy for g in gaps])
+
+    def test_same_as_naive(self):
+        for netlist, gaps in self.cases():
+            # gaps not in height order
+            self.check_table(netlist, gaps[::2] + gaps[1::2])
+
+    def test_chunks(self):
+        with mock.patch.object(wirelength, "CHUNK_SIZE", 7):
+            for netlist, gaps in self.cases():
+                self.check_table(netlist, gaps)
+
+    def test_empty(self):
+        netlist, gaps = next(self.cases())
+        self.assertEqual(WirelengthTable(netlist, []).table.shape, (len(netlist), 0))
+        self.assertEqual(WirelengthTable([], gaps).table.shape, (0, len(gaps)))
+
+
+if __name__ == "__main__":
+    unittest.main()